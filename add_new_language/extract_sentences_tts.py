@@ -4,6 +4,16 @@ import json
 from pathlib import Path
 
 
+def tts_lines(sentences_data):
+    """Return the ``symbol_name_1 "sentence"`` lines for generated_sentences.json data."""
+    output_lines = []
+    for key, value in sentences_data.items():
+        if isinstance(value, list):
+            for i, sentence in enumerate(value):
+                output_lines.append(f'{key.lower()}_{i + 1} "{sentence}"')
+    return output_lines
+
+
 def main():
     """
     Extracts sentences from a language's generated_sentences.json file and saves them to a text file
@@ -33,14 +43,8 @@ def main():
     with open(generated_sentences_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
 
-    output_lines = []
-    for key, value in data.items():
-        if isinstance(value, list):
-            for i, sentence in enumerate(value):
-                output_lines.append(f'{key.lower()}_{i + 1} "{sentence}"')
-
     with open(output_tts_path, 'w', encoding='utf-8') as f:
-        f.write("\n".join(output_lines))
+        f.write("\n".join(tts_lines(data)))
 
     print(f"Successfully extracted sentences to {output_tts_path}")
 
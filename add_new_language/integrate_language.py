@@ -1,66 +1,81 @@
 #!/usr/bin/env python
-import sys
+import argparse
+import hashlib
 import json
-from pathlib import Path
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-
-def main():
-    """
-    Integrates a new language into the application.
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif"}
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def is_unchanged(src, dest, checksum):
+    """Compare by size and mtime, or by content hash when ``checksum`` is set."""
+    try:
+        dest_stat = dest.stat()
+    except FileNotFoundError:
+        return False
+    src_stat = src.stat()
+    if src_stat.st_size != dest_stat.st_size:
+        return False
+    if checksum:
+        return file_digest(src) == file_digest(dest)
+    # copy2 preserves mtimes and hardlinks share them.
+    return int(src_stat.st_mtime) == int(dest_stat.st_mtime)
+
+
+def plan_sync(sources, dest_dir, checksum):
+    """Return ``(src, dest, action)`` for every source file that needs copying."""
+    plan = []
+    for src in sources:
+        dest = dest_dir / src.name
+        if not dest.exists():
+            plan.append((src, dest, "add"))
+        elif not is_unchanged(src, dest, checksum):
+            plan.append((src, dest, "update"))
+    return plan
+
+
+def sync_file(src, dest, hardlink):
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if hardlink:
+        tmp = dest.with_name(dest.name + ".tmp")
+        tmp.unlink(missing_ok=True)
+        try:
+            os.link(src, tmp)
+            os.replace(tmp, dest)
+            return
+        except OSError:
+            pass  # e.g. across filesystems; fall back to copying
+    shutil.copy2(src, dest)
+
+
+def write_json_atomic(path, data):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def build_locale(lang_dir, en_data):
+    """Build the locale JSON for a language from its prepared assets.
+
+    Returns ``None`` after printing the reason when the inputs do not match.
     """
-    if len(sys.argv) != 3:
-        print("Usage: python integrate_language.py <LanguageName> <lang_code>")
-        print("Example: python integrate_language.py Serbian sr")
-        return
-
-    lang_name = sys.argv[1]
-    lang_code = sys.argv[2]
-
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent
-    lang_dir = script_dir / lang_name
-
-    # Define paths
     translated_ui_path = lang_dir / "translated_ui.txt"
     generated_sentences_path = lang_dir / "generated_sentences.json"
-    flag_icon_path = lang_dir / f"{lang_code}.svg"
-    mp3_source_dir = project_root / "tts" / lang_code
-    symbols_source_dir = lang_dir / "symbols"
-
-    locales_dir = project_root / "frontend" / "static" / "locales"
-    langs_dir = project_root / "frontend" / "static" / "langs"
-    mp3_dest_dir = project_root / "frontend" / "static" / "mp3s" / lang_code
-    symbols_dest_dir = project_root / "frontend" / "static" / "symbols" / lang_code
-
-    output_locale_path = locales_dir / f"{lang_code}.json"
 
-    # Check if source files exist
-    if not lang_dir.is_dir():
-        print(f"Error: Language directory not found at {lang_dir}")
-        return
-    if not translated_ui_path.exists():
-        print(f"Error: translated_ui.txt not found in {lang_dir}")
-        return
-    if not generated_sentences_path.exists():
-        print(f"Error: generated_sentences.json not found in {lang_dir}")
-        return
-    if not flag_icon_path.exists():
-        print(f"Error: {lang_code}.svg not found in {lang_dir}")
-        return
-
-    # Create the locale JSON file
     locale_data = {}
 
-    # Read UI translations from the original English file to get the keys
-    en_locale_path = locales_dir / "en.json"
-    if not en_locale_path.exists():
-        print(f"Error: en.json not found at {en_locale_path}")
-        return
-
-    with open(en_locale_path, 'r', encoding='utf-8') as f:
-        en_data = json.load(f)
-
     sentence_keys = {k.replace("_sentences", "") for k in en_data if k.endswith("_sentences")}
     ui_keys = [k for k in en_data if not k.endswith("_sentences") and k not in sentence_keys]
 
@@ -71,7 +86,7 @@ def main():
         print("Error: Mismatch between the number of UI keys and translated strings.")
         print(f"UI keys ({len(ui_keys)}): {ui_keys}")
         print(f"UI translations ({len(ui_translations)}): {ui_translations}")
-        return
+        return None
 
     for key, translation in zip(ui_keys, ui_translations):
         locale_data[key] = translation
@@ -88,40 +103,149 @@ def main():
     for key, value in sentences_data.items():
         locale_data[f"{key.lower()}_sentences"] = value
 
-    # Write the new locale file
-    with open(output_locale_path, 'w', encoding='utf-8') as f:
-        json.dump(locale_data, f, ensure_ascii=False, indent=2)
+    return locale_data
 
-    print(f"Successfully created {output_locale_path}")
 
-    # Move the flag icon
-    shutil.copy(flag_icon_path, langs_dir / f"{lang_code}.svg")
-    print(f"Successfully copied {flag_icon_path} to {langs_dir}")
+def prepare_language(lang_name, lang_code, script_dir, project_root, en_data, checksum):
+    """Check a language's inputs and work out what integrating it would change.
+
+    Returns ``(locale_path, locale_data or None if unchanged, file plan)``, or
+    ``None`` if the language cannot be integrated.
+    """
+    lang_dir = script_dir / lang_name
+
+    flag_icon_path = lang_dir / f"{lang_code}.svg"
+    mp3_source_dir = project_root / "tts" / lang_code
+    symbols_source_dir = lang_dir / "symbols"
+
+    locales_dir = project_root / "frontend" / "static" / "locales"
+    langs_dir = project_root / "frontend" / "static" / "langs"
+    mp3_dest_dir = project_root / "frontend" / "static" / "mp3s" / lang_code
+    symbols_dest_dir = project_root / "frontend" / "static" / "symbols" / lang_code
+
+    output_locale_path = locales_dir / f"{lang_code}.json"
+
+    # Check if source files exist
+    if not lang_dir.is_dir():
+        print(f"Error: Language directory not found at {lang_dir}")
+        return None
+    if not (lang_dir / "translated_ui.txt").exists():
+        print(f"Error: translated_ui.txt not found in {lang_dir}")
+        return None
+    if not (lang_dir / "generated_sentences.json").exists():
+        print(f"Error: generated_sentences.json not found in {lang_dir}")
+        return None
+    if not flag_icon_path.exists():
+        print(f"Error: {lang_code}.svg not found in {lang_dir}")
+        return None
+
+    locale_data = build_locale(lang_dir, en_data)
+    if locale_data is None:
+        return None
+    try:
+        with open(output_locale_path, 'r', encoding='utf-8') as f:
+            if json.load(f) == locale_data:
+                locale_data = None
+    except (OSError, ValueError):
+        pass
+
+    plan = plan_sync([flag_icon_path], langs_dir, checksum)
 
-    # Move the mp3 files
     if mp3_source_dir.is_dir():
-        mp3_dest_dir.mkdir(parents=True, exist_ok=True)
-        for mp3_file in mp3_source_dir.glob("*.mp3"):
-            shutil.copy(mp3_file, mp3_dest_dir / mp3_file.name)
-        print(f"Successfully copied MP3s from {mp3_source_dir} to {mp3_dest_dir}")
+        plan += plan_sync(sorted(mp3_source_dir.glob("*.mp3")), mp3_dest_dir, checksum)
     else:
         print(f"Warning: MP3 source directory not found at {mp3_source_dir}")
 
-    # Move the symbol images
     if symbols_source_dir.is_dir():
-        symbols_dest_dir.mkdir(parents=True, exist_ok=True)
-        for symbol_file in symbols_source_dir.glob("*.png"):
-            shutil.copy(symbol_file, symbols_dest_dir / symbol_file.name)
-        for symbol_file in symbols_source_dir.glob("*.jpg"):
-            shutil.copy(symbol_file, symbols_dest_dir / symbol_file.name)
-        for symbol_file in symbols_source_dir.glob("*.jpeg"):
-            shutil.copy(symbol_file, symbols_dest_dir / symbol_file.name)
-        for symbol_file in symbols_source_dir.glob("*.gif"):
-            shutil.copy(symbol_file, symbols_dest_dir / symbol_file.name)
-        print(f"Successfully copied symbols from {symbols_source_dir} to {symbols_dest_dir}")
+        symbol_files = sorted(p for p in symbols_source_dir.iterdir()
+                              if p.is_file() and p.suffix.lower() in IMAGE_SUFFIXES)
+        plan += plan_sync(symbol_files, symbols_dest_dir, checksum)
     else:
         print(f"Warning: Symbols source directory not found at {symbols_source_dir}")
 
+    return output_locale_path, locale_data, plan
+
+
+def integrate_languages(pairs, dry_run=False, checksum=False, hardlink=False, workers=8):
+    """Integrate each ``(LanguageName, lang_code)`` pair, printing the plan first.
+
+    Returns the number of files written, or ``None`` if en.json is missing or
+    a language could not be integrated.
+    """
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent
+
+    # Read UI translations from the original English file to get the keys
+    en_locale_path = project_root / "frontend" / "static" / "locales" / "en.json"
+    if not en_locale_path.exists():
+        print(f"Error: en.json not found at {en_locale_path}")
+        return None
+
+    with open(en_locale_path, 'r', encoding='utf-8') as f:
+        en_data = json.load(f)
+
+    locale_writes = []
+    file_plan = []
+    skipped = False
+    for lang_name, lang_code in pairs:
+        prepared = prepare_language(lang_name, lang_code, script_dir, project_root, en_data, checksum)
+        if prepared is None:
+            print(f"Skipping {lang_name} ({lang_code}).")
+            skipped = True
+            continue
+        locale_path, locale_data, plan = prepared
+
+        print(f"{lang_name} ({lang_code}):")
+        if locale_data is not None:
+            print(f"  write  {locale_path.relative_to(project_root)}")
+            locale_writes.append((locale_path, locale_data))
+        for src, dest, action in plan:
+            print(f"  {action:<6} {dest.relative_to(project_root)}")
+        if locale_data is None and not plan:
+            print("  up to date")
+        file_plan += plan
+
+    if dry_run or (not locale_writes and not file_plan):
+        return None if skipped else 0
+
+    for locale_path, locale_data in locale_writes:
+        write_json_atomic(locale_path, locale_data)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for future in [pool.submit(sync_file, src, dest, hardlink) for src, dest, _ in file_plan]:
+            future.result()
+
+    print(f"Successfully wrote {len(locale_writes)} locale file(s) and synced {len(file_plan)} file(s).")
+    return None if skipped else len(locale_writes) + len(file_plan)
+
+
+def main():
+    """
+    Integrates one or more new languages into the application.
+
+    Only the locale files and assets that differ from what is already in
+    frontend/static are written. The plan is printed before anything changes.
+    """
+    parser = argparse.ArgumentParser(
+        description="Integrate prepared languages into frontend/static.",
+        epilog="Example: python integrate_language.py Serbian sr Polish pl",
+    )
+    parser.add_argument("languages", nargs="+", metavar="LanguageName lang_code",
+                        help="One or more <LanguageName> <lang_code> pairs")
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan without changing anything")
+    parser.add_argument("--checksum", action="store_true",
+                        help="Compare file contents instead of size and modification time")
+    parser.add_argument("--hardlink", action="store_true",
+                        help="Hardlink files instead of copying them where possible")
+    parser.add_argument("--workers", type=int, default=8, help="Parallel file copies (default: 8)")
+    args = parser.parse_args()
+
+    if len(args.languages) % 2:
+        parser.error("languages must be given as <LanguageName> <lang_code> pairs")
+    pairs = list(zip(args.languages[::2], args.languages[1::2]))
+
+    integrate_languages(pairs, args.dry_run, args.checksum, args.hardlink, args.workers)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Everything below changes the output; bump it to reprocess every file.
+PIPELINE_VERSION = 1
+SAMPLE_RATE = 24000  # gTTS output rate; Opus supports it natively
+OPUS_BITRATE = "24k"
+MP3_BITRATE = "48k"
+# Quieter than this counts as silence at either end of a sentence.
+SILENCE_THRESHOLD = "-50dB"
+# Keep a short pad so trimming never clips the first consonant.
+SILENCE_PAD = 0.05
+# EBU R128 speech target, as used by podcast and broadcast platforms.
+LOUDNESS = "I=-16:TP=-1.5:LRA=11"
+
+TRIM = f"silenceremove=start_periods=1:start_threshold={SILENCE_THRESHOLD}:start_silence={SILENCE_PAD}"
+# Trailing silence is trimmed by reversing, trimming the start and reversing back.
+FILTERS = f"{TRIM},areverse,{TRIM},areverse,loudnorm={LOUDNESS}"
+
+CACHE_NAME = ".audio_cache.json"
+_SILENCE_END_RE = re.compile(r"silence_end: ([0-9.]+)")
+_SILENCE_START_RE = re.compile(r"silence_start: (-?[0-9.]+)")
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256(f"{PIPELINE_VERSION}\0{FILTERS}\0{OPUS_BITRATE}\0{MP3_BITRATE}\0".encode('utf-8'))
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def output_paths(source: Path, mp3s_dir: Path, variants_dir: Path) -> tuple:
+    """``mp3s/pl/a_1.mp3`` -> ``variants/mp3s/pl/a_1.ogg`` and ``.mp3``."""
+    base = variants_dir / "mp3s" / source.relative_to(mp3s_dir).with_suffix("")
+    return base.with_suffix(".ogg"), base.with_suffix(".mp3")
+
+
+def process_file(source: Path, opus_path: Path, mp3_path: Path) -> None:
+    """Trim, normalise and encode ``source`` once into Opus and mp3."""
+    opus_path.parent.mkdir(parents=True, exist_ok=True)
+    opus_tmp = opus_path.with_name(opus_path.name + ".part")
+    mp3_tmp = mp3_path.with_name(mp3_path.name + ".part")
+    common = ["-ar", str(SAMPLE_RATE), "-ac", "1", "-map_metadata", "-1"]
+    try:
+        subprocess.run(
+            ["ffmpeg", "-loglevel", "error", "-y", "-i", str(source),
+             "-filter_complex", f"[0:a]{FILTERS},asplit=2[opus][mp3]",
+             "-map", "[opus]", *common, "-c:a", "libopus", "-b:a", OPUS_BITRATE,
+             "-application", "voip", "-f", "ogg", str(opus_tmp),
+             "-map", "[mp3]", *common, "-c:a", "libmp3lame", "-b:a", MP3_BITRATE, "-f", "mp3", str(mp3_tmp)],
+            check=True, capture_output=True,
+        )
+        os.replace(opus_tmp, opus_path)
+        os.replace(mp3_tmp, mp3_path)
+    finally:
+        opus_tmp.unlink(missing_ok=True)
+        mp3_tmp.unlink(missing_ok=True)
+
+
+def leading_silence(path: Path) -> float:
+    """Seconds before the first audible sample of ``path``."""
+    stderr = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-nostats", "-i", str(path),
+         "-af", f"silencedetect=n={SILENCE_THRESHOLD}:d=0.01", "-f", "null", "-"],
+        check=True, capture_output=True, text=True,
+    ).stderr
+    start = _SILENCE_START_RE.search(stderr)
+    if start is None or float(start.group(1)) > 0.001:
+        return 0.0
+    end = _SILENCE_END_RE.search(stderr)
+    # Silent until the end: the whole file is silence.
+    return float(end.group(1)) if end else float("inf")
+
+
+def load_json(path: Path) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_json(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=0, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def language_sources(mp3s_dir: Path, languages) -> list:
+    languages = languages or sorted(p.name for p in mp3s_dir.iterdir() if p.is_dir())
+    sources = []
+    for lang in languages:
+        lang_dir = mp3s_dir / lang
+        if not lang_dir.is_dir():
+            print(f"Warning: No audio directory for '{lang}' at {lang_dir}")
+            continue
+        sources += sorted(lang_dir.glob("*.mp3"))
+    return sources
+
+
+def optimize_audio(languages=None, workers=None):
+    """Process the sentence audio of ``languages`` (default: all).
+
+    Returns the number of files that failed, or ``None`` if ffmpeg or the
+    audio directory is missing.
+    """
+    project_root = Path(__file__).parent.parent
+    static_dir = project_root / "frontend" / "static"
+    mp3s_dir = static_dir / "mp3s"
+    variants_dir = static_dir / "variants"
+    index_path = variants_dir / "audio.json"
+    cache_path = variants_dir / "mp3s" / CACHE_NAME
+
+    if shutil.which("ffmpeg") is None:
+        print("Error: ffmpeg is required to process audio (e.g. apt-get install ffmpeg)")
+        return None
+    if not mp3s_dir.is_dir():
+        print(f"Error: Audio directory not found at {mp3s_dir}")
+        return None
+
+    sources = language_sources(mp3s_dir, languages)
+    index = load_json(index_path)
+    # source path -> digest of the source and pipeline settings it was built from
+    cache = load_json(cache_path)
+    processed_langs = {s.parent.name for s in sources}
+    index = {k: v for k, v in index.items() if k.split("/")[1] not in processed_langs}
+
+    jobs = []
+    for source in sources:
+        key = source.relative_to(static_dir).as_posix()
+        opus_path, mp3_path = output_paths(source, mp3s_dir, variants_dir)
+        digest = file_digest(source)
+        entry = {
+            "opus": opus_path.relative_to(static_dir).as_posix(),
+            "mp3": mp3_path.relative_to(static_dir).as_posix(),
+        }
+        if cache.get(key) == digest and opus_path.exists() and mp3_path.exists():
+            index[key] = entry
+            continue
+        jobs.append((key, source, opus_path, mp3_path, digest, entry))
+
+    print(f"{len(jobs)} of {len(sources)} file(s) to process")
+    failures = 0
+    # ffmpeg does the work; threads only wait for it.
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        futures = [(job, pool.submit(process_file, *job[1:4])) for job in jobs]
+        for (key, source, _, _, digest, entry), future in futures:
+            try:
+                future.result()
+            except subprocess.CalledProcessError as e:
+                failures += 1
+                print(f"Error processing {source}: {e.stderr.decode('utf-8', 'replace').strip()}")
+                continue
+            cache[key] = digest
+            index[key] = entry
+
+    write_json(cache_path, cache)
+    write_json(index_path, index)
+
+    original = sum(s.stat().st_size for s in sources)
+    opus = sum((static_dir / index[k]["opus"]).stat().st_size for k in index if k.split("/")[1] in processed_langs)
+    mp3 = sum((static_dir / index[k]["mp3"]).stat().st_size for k in index if k.split("/")[1] in processed_langs)
+    if original:
+        print(f"{len(sources)} files: {original:,} bytes -> Opus {opus:,} ({100 * opus / original:.0f}%), "
+              f"mp3 {mp3:,} ({100 * mp3 / original:.0f}%)")
+    if failures:
+        print(f"{failures} file(s) failed; rerun to retry them.")
+    print(f"Successfully wrote {index_path}")
+    return failures
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, round(p / 100 * len(values)) - 1))] if values else 0.0
+
+
+def benchmark(languages=None, bandwidth_kbps=1000, rtt_ms=50):
+    """Estimate the time from showing a sentence to its first audible sample.
+
+    Per round that is one request round trip, the download of the file
+    (audio elements only start once enough of it has arrived; the whole of
+    these short files, in practice) and the leading silence.
+    """
+    if shutil.which("ffmpeg") is None:
+        print("Error: ffmpeg is required for the benchmark")
+        return
+
+    project_root = Path(__file__).parent.parent
+    static_dir = project_root / "frontend" / "static"
+    index = load_json(static_dir / "variants" / "audio.json")
+    sources = language_sources(static_dir / "mp3s", languages)
+
+    def measure(paths):
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+            silences = list(pool.map(leading_silence, paths))
+        results = []
+        for path, silence in zip(paths, silences):
+            transfer = path.stat().st_size * 8 / (bandwidth_kbps * 1000)
+            results.append((path.stat().st_size, silence, rtt_ms / 1000 + transfer + silence))
+        return results
+
+    variants = {
+        "original mp3": sources,
+        "processed mp3": [static_dir / index[k]["mp3"] for k in (s.relative_to(static_dir).as_posix() for s in sources)
+                          if k in index],
+        "processed opus": [static_dir / index[k]["opus"] for k in (s.relative_to(static_dir).as_posix() for s in sources)
+                           if k in index],
+    }
+    print(f"Time to first audible sample at {bandwidth_kbps} kbit/s and {rtt_ms} ms round trip:")
+    print(f"  {'variant':<16}{'files':>7}{'avg bytes':>11}{'lead p50 ms':>13}{'lead p95 ms':>13}"
+          f"{'TTFA p50 ms':>13}{'TTFA p95 ms':>13}")
+    for name, paths in variants.items():
+        if not paths:
+            print(f"  {name:<16}{0:>7}  (run without --benchmark first)")
+            continue
+        results = measure(paths)
+        sizes, silences, ttfa = zip(*results)
+        print(f"  {name:<16}{len(paths):>7}{sum(sizes) / len(sizes):>11,.0f}"
+              f"{percentile(silences, 50) * 1000:>13.0f}{percentile(silences, 95) * 1000:>13.0f}"
+              f"{percentile(ttfa, 50) * 1000:>13.0f}{percentile(ttfa, 95) * 1000:>13.0f}")
+
+
+def main():
+    """
+    Post-processes the sentence audio in frontend/static/mp3s/{lang}: trims
+    leading and trailing silence, normalises loudness (EBU R128) and encodes
+    each file once into a low-bitrate Opus file with an mp3 fallback under
+    frontend/static/variants/mp3s/. Writes frontend/static/variants/audio.json
+    for the backend, which then offers the processed files to the client.
+    Files run in parallel, and a file is only reprocessed when its content
+    (or the pipeline settings) changed. Requires ffmpeg with libopus and
+    libmp3lame. With --benchmark, reports the time to the first audible
+    sample per round for the original and processed files.
+    """
+    parser = argparse.ArgumentParser(description="Trim, normalise and transcode TTS audio.")
+    parser.add_argument("languages", nargs="*", help="Language codes (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent ffmpeg processes (default: CPU count)")
+    parser.add_argument("--benchmark", action="store_true", help="Measure time to first audible sample")
+    parser.add_argument("--bandwidth", type=int, default=1000, help="Benchmark bandwidth in kbit/s (default: 1000)")
+    parser.add_argument("--rtt", type=int, default=50, help="Benchmark round trip in ms (default: 50)")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.languages, args.bandwidth, args.rtt)
+    else:
+        optimize_audio(args.languages, args.workers)
+
+
+if __name__ == "__main__":
+    main()
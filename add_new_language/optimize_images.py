@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Pillow does the resizing and encoding: pip install Pillow
+from PIL import Image
+
+# Target widths in pixels; an option image is at most 400 CSS pixels wide.
+TARGET_WIDTHS = (240, 480)
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif"}
+WEBP_QUALITY = 80
+
+
+def _variant_paths(source: Path, symbols_dir: Path, variants_dir: Path, width: int):
+    # Keep the original extension in the name: ``pita.png`` and ``pita.jpg`` can coexist.
+    relative = source.relative_to(symbols_dir)
+    base = variants_dir / relative.parent / f"{relative.name}.{width}"
+    return base.parent / f"{base.name}.webp", base.parent / f"{base.name}.png"
+
+
+def _is_fresh(target: Path, source: Path) -> bool:
+    try:
+        return target.stat().st_mtime >= source.stat().st_mtime
+    except OSError:
+        return False
+
+
+def optimize_image(source: Path, symbols_dir: Path, variants_dir: Path) -> list:
+    """Write the WebP and PNG variants of ``source`` that are missing or stale.
+
+    Returns one entry per variant for the index, in ascending width order.
+    """
+    # Opening only reads the header; pixels are decoded on first use.
+    image = Image.open(source)
+    # Never upscale: sources narrower than a target width get a single variant.
+    widths = sorted({min(width, image.width) for width in TARGET_WIDTHS})
+    has_alpha = "A" in image.getbands() or "transparency" in image.info
+    converted = None
+
+    entries = []
+    for width in widths:
+        webp_path, png_path = _variant_paths(source, symbols_dir, variants_dir, width)
+        if not (_is_fresh(webp_path, source) and _is_fresh(png_path, source)):
+            if converted is None:
+                converted = image.convert("RGBA" if has_alpha else "RGB")
+            resized = converted.resize(
+                (width, max(1, round(image.height * width / image.width))),
+                Image.LANCZOS,
+                reducing_gap=3.0,
+            )
+            webp_path.parent.mkdir(parents=True, exist_ok=True)
+            resized.save(webp_path, "WEBP", quality=WEBP_QUALITY, method=4)
+            # The PNG fallback is palettised; symbols are flat illustrations.
+            resized.quantize(256, method=Image.Quantize.FASTOCTREE).save(png_path, "PNG", optimize=True)
+        entries.append({"width": width, "webp": webp_path, "png": png_path})
+    return entries
+
+
+def optimize_languages(languages=None):
+    """Update the variants and index entries of ``languages`` (default: all)."""
+    project_root = Path(__file__).parent.parent
+    static_dir = project_root / "frontend" / "static"
+    symbols_dir = static_dir / "symbols"
+    variants_dir = static_dir / "variants"
+    index_path = variants_dir / "index.json"
+
+    if not symbols_dir.is_dir():
+        print(f"Error: Symbols directory not found at {symbols_dir}")
+        return
+
+    languages = languages or sorted(p.name for p in symbols_dir.iterdir() if p.is_dir())
+
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+
+    jobs = {}
+    with ProcessPoolExecutor() as pool:
+        for lang in languages:
+            lang_dir = symbols_dir / lang
+            if not lang_dir.is_dir():
+                print(f"Warning: No symbols directory for '{lang}' at {lang_dir}")
+                continue
+            # Forget variants of images that were removed from this language.
+            prefix = f"symbols/{lang}/"
+            index = {k: v for k, v in index.items() if not k.startswith(prefix)}
+            for source in sorted(lang_dir.iterdir()):
+                if source.suffix.lower() in IMAGE_SUFFIXES:
+                    jobs[source] = (lang, pool.submit(optimize_image, source, symbols_dir, variants_dir))
+
+        report = {}
+        for source, (lang, future) in jobs.items():
+            try:
+                entries = future.result()
+            except Exception as e:
+                print(f"Error optimizing {source}: {e}")
+                continue
+            index[source.relative_to(static_dir).as_posix()] = [
+                {
+                    "width": entry["width"],
+                    "webp": entry["webp"].relative_to(static_dir).as_posix(),
+                    "png": entry["png"].relative_to(static_dir).as_posix(),
+                }
+                for entry in entries
+            ]
+            original = source.stat().st_size
+            largest = entries[-1]
+            optimized = min(largest["webp"].stat().st_size, largest["png"].stat().st_size)
+            totals = report.setdefault(lang, [0, 0, 0])
+            totals[0] += 1
+            totals[1] += original
+            totals[2] += optimized
+
+    variants_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_suffix(".json.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=0, sort_keys=True)
+    os.replace(tmp_path, index_path)
+
+    # Bytes per image at the largest target width versus the original.
+    print(f"{'lang':<8}{'images':>8}{'original':>14}{'optimized':>14}{'saved':>8}")
+    for lang, (count, original, optimized) in sorted(report.items()):
+        saved = 100 * (original - optimized) / original if original else 0
+        print(f"{lang:<8}{count:>8}{original:>14,}{optimized:>14,}{saved:>7.0f}%")
+    print(f"Successfully wrote {index_path}")
+
+
+def main():
+    """
+    Produces resized WebP variants (with a PNG fallback) of every symbol image
+    under frontend/static/symbols into frontend/static/variants, and writes
+    frontend/static/variants/index.json for the backend, which offers them to
+    the client as srcset candidates. Only missing or outdated variants are
+    regenerated. Pass language codes (or "common") to limit the run.
+    """
+    optimize_languages(sys.argv[1:])
+
+
+if __name__ == "__main__":
+    main()
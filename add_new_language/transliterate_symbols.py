@@ -1,8 +1,9 @@
+import argparse
 import json
+import os
 import re
+import timeit
 from pathlib import Path
-import os
-import sys
 
 # Define a comprehensive Cyrillic to Latin transliteration map for Macedonian and Serbian
 language_transliteration_maps = {
@@ -23,7 +24,7 @@ language_transliteration_maps = {
     },
     "sr": {
         'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'ђ': 'dj', 'е': 'e', 'ж': 'z', 'з': 'z', 'и': 'i',
-        'ј': 'j', 'k': 'k', 'л': 'l', 'љ': 'lj', 'м': 'm', 'н': 'n', 'њ': 'nj', 'о': 'o', 'п': 'p',
+        'ј': 'j', 'к': 'k', 'л': 'l', 'љ': 'lj', 'м': 'm', 'н': 'n', 'њ': 'nj', 'о': 'o', 'п': 'p',
         'р': 'r', 'с': 's', 'т': 't', 'ћ': 'c', 'у': 'u', 'ф': 'f', 'х': 'h', 'ц': 'c', 'ч': 'c',
         'џ': 'dz', 'ш': 's',
 
@@ -56,127 +57,223 @@ language_transliteration_maps = {
 }
 
 
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif"}
+
+
+class Transliterator:
+    """A character map compiled once into a ``str.translate`` table.
+
+    The table is a list indexed by code point rather than the dict that
+    ``str.maketrans`` returns: lookups are about twice as fast, and code points
+    past its end raise IndexError, which ``str.translate`` treats as unmapped.
+    Every map only covers non-ASCII letters, so ASCII text is returned as is.
+
+    Letters that map to digraphs (``Џ`` -> ``Dz``, ``Љ`` -> ``Lj``, ...) are
+    title-cased in the map; a small rule layer upper-cases the whole digraph
+    when the next letter is upper case too, so ``ЏЕМ`` becomes ``DZEM``
+    rather than ``DzEM``.
+    """
+
+    def __init__(self, char_map):
+        self.table = [char_map.get(chr(i), chr(i)) for i in range(max(map(ord, char_map)) + 1)]
+        digraphs = "".join(sorted(c for c, latin in char_map.items() if len(latin) > 1 and c.isupper()))
+        self.digraph_re = re.compile(f"([{re.escape(digraphs)}])(?=([^\\W\\d_]))") if digraphs else None
+
+    def _upper_digraph(self, match):
+        letter = match.group(1)
+        return letter.translate(self.table).upper() if match.group(2).isupper() else letter
+
+    def __call__(self, text):
+        if text.isascii():
+            return text
+        if self.digraph_re is not None:
+            text = self.digraph_re.sub(self._upper_digraph, text)
+        return text.translate(self.table)
+
+
+TRANSLITERATORS = {code: Transliterator(char_map) for code, char_map in language_transliteration_maps.items()}
+
+
 def transliterate_text(text, char_map):
+    """Reference implementation, one character at a time; used by ``--benchmark``."""
     result = []
     for char in text:
         result.append(char_map.get(char, char))
     return "".join(result)
 
 
-def transliterate_filename(filename, char_map, is_mp3=False):
-    stem = Path(filename).stem
+# Keys and file names only ever carry ASCII suffixes (``_1``, ``_sentences``,
+# ``.mp3``) next to the symbol name, so the whole string can be transliterated.
 
-    transliterated_stem = ""
-    if is_mp3:
-        # For mp3s, we need to handle _1, _2 suffixes
-        match = re.match(r"(.+?)(_\d+)?$", stem)
-        if match:
-            symbol_base = match.group(1)
-            suffix = match.group(2) if match.group(2) else ""
-            transliterated_base = transliterate_text(symbol_base, char_map)
-            transliterated_stem = f"{transliterated_base}{suffix}"
-    else:
-        transliterated_stem = transliterate_text(stem, char_map)
-
-    return f"{transliterated_stem}{Path(filename).suffix}"
-
-
-def process_language(lang_code, char_map):
-    project_root = Path(__file__).parent
-
-    # --- Rename image files ---
-    symbols_dir = project_root / "frontend" / "static" / "symbols" / lang_code
-    if symbols_dir.is_dir():
-        print(f"Renaming image files in {symbols_dir}...")
-        for p in symbols_dir.iterdir():
-            if p.suffix.lower() in {".png", ".jpg", ".jpeg", ".gif"}:
-                old_name = p.name
-                new_name = transliterate_filename(old_name, char_map)
-                if old_name != new_name:
-                    os.rename(p, p.parent / new_name)
-                    print(f"  Renamed {old_name} to {new_name}")
-
-    # --- Rename MP3 files ---
-    mp3_dir = project_root / "frontend" / "static" / "mp3s" / lang_code
-    if mp3_dir.is_dir():
-        print(f"Renaming MP3 files in {mp3_dir}...")
-        for p in mp3_dir.iterdir():
-            if p.suffix.lower() == ".mp3":
-                old_name = p.name
-                new_name = transliterate_filename(old_name, char_map, is_mp3=True)
-                if old_name != new_name:
-                    os.rename(p, p.parent / new_name)
-                    print(f"  Renamed {old_name} to {new_name}")
+def plan_renames(directory, suffixes, transliterate):
+    """Return ``(renames, collisions)`` for the files in ``directory``.
 
-    # --- Update locale JSON file ---
-    locale_path = project_root / "frontend" / "static" / "locales" / f"{lang_code}.json"
-    if locale_path.exists():
-        print(f"Updating locale file {locale_path}...")
-        with open(locale_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+    A collision is a target name that more than one file would get, or that an
+    existing file which is not being renamed already has.
+    """
+    renames = []
+    targets = {}
+    names = set()
+    for p in sorted(directory.iterdir()):
+        names.add(p.name)
+        if p.suffix.lower() not in suffixes:
+            continue
+        new_name = transliterate(p.name)
+        targets.setdefault(new_name, []).append(p.name)
+        if new_name != p.name:
+            renames.append((p, p.parent / new_name))
 
-        new_data = {}
-        for key, value in data.items():
-            new_key = key
+    moved = {src.name for src, _ in renames}
+    collisions = []
+    for new_name, sources in targets.items():
+        if len(sources) > 1 or (new_name in names and new_name not in moved and new_name not in sources):
+            collisions.append((new_name, sources))
+    return renames, collisions
+
+
+def rewrite_locale(locale_path, transliterate, dry_run):
+    with open(locale_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
 
-            # Transliterate base key
-            transliterated_base_key = transliterate_text(key, char_map)
+    new_data = {}
+    collisions = []
+    for key, value in data.items():
+        new_key = transliterate(key)
+        if new_key in new_data:
+            collisions.append(new_key)
+        new_data[new_key] = value
 
-            # Handle keys with _sentences suffix
-            if key.endswith("_sentences"):
-                base_key_without_suffix = key.replace("_sentences", "")
-                transliterated_base_key_without_suffix = transliterate_text(base_key_without_suffix, char_map)
-                new_key = f"{transliterated_base_key_without_suffix}_sentences"
-            else:
-                new_key = transliterated_base_key
+    if collisions:
+        print(f"  Error: keys collide after transliteration: {', '.join(collisions)}")
+        return
+    changed = sum(1 for old, new in zip(data, new_data) if old != new)
+    if not changed:
+        return
+    print(f"  {changed} key(s) to update in {locale_path}")
+    if dry_run:
+        return
 
-            new_data[new_key] = value
+    tmp_path = locale_path.with_name(locale_path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(new_data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, locale_path)
 
-        with open(locale_path, 'w', encoding='utf-8') as f:
-            json.dump(new_data, f, ensure_ascii=False, indent=2)
-        print(f"  Updated keys in {locale_path}")
+
+def rewrite_tts_file(tts_path, transliterate, dry_run):
+    """Transliterate the key of each ``key "sentence"`` line, one line at a time."""
+    tmp_path = tts_path.with_name(tts_path.name + ".tmp")
+    changed = 0
+    with open(tts_path, 'r', encoding='utf-8') as src, \
+            open(os.devnull if dry_run else tmp_path, 'w', encoding='utf-8') as dst:
+        for line in src:
+            key, sep, sentence = line.partition(" ")
+            if sep:
+                new_key = transliterate(key)
+                if new_key != key:
+                    changed += 1
+                    line = f"{new_key} {sentence}"
+            dst.write(line)
+
+    if changed:
+        print(f"  {changed} key(s) to update in {tts_path}")
+    if dry_run:
+        return
+    if changed:
+        os.replace(tmp_path, tts_path)
+    else:
+        tmp_path.unlink()
+
+
+def process_language(lang_code, transliterate, dry_run=False):
+    project_root = Path(__file__).parent.parent
+    static_dir = project_root / "frontend" / "static"
+
+    # --- Rename image and MP3 files ---
+    rename_dirs = [
+        (static_dir / "symbols" / lang_code, IMAGE_SUFFIXES),
+        (static_dir / "mp3s" / lang_code, {".mp3"}),
+    ]
+    for directory, suffixes in rename_dirs:
+        if not directory.is_dir():
+            continue
+        renames, collisions = plan_renames(directory, suffixes, transliterate)
+        if collisions:
+            print(f"Error: renaming files in {directory} would overwrite files:")
+            for new_name, sources in collisions:
+                print(f"  {new_name} <- {', '.join(sources)}")
+            print("  No files were renamed.")
+            continue
+        if renames:
+            print(f"Renaming {len(renames)} file(s) in {directory}...")
+        for src, dest in renames:
+            print(f"  {src.name} -> {dest.name}")
+            if not dry_run:
+                os.rename(src, dest)
+
+    # --- Update locale JSON file ---
+    locale_path = static_dir / "locales" / f"{lang_code}.json"
+    if locale_path.exists():
+        rewrite_locale(locale_path, transliterate, dry_run)
 
     # --- Update TTS text file ---
     tts_path = project_root / "tts" / f"tts_{lang_code}.txt"
     if tts_path.exists():
-        print(f"Updating TTS text file {tts_path}...")
-        with open(tts_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        new_lines = []
-        for line in lines:
-            parts = line.split(" ", 1)
-            if len(parts) > 1:
-                key_part = parts[0]
-                sentence_part = parts[1]
-
-                # Handle keys like "ајвар_1"
-                match = re.match(r"(.+?)(_\d+)?$", key_part)
-                if match:
-                    symbol_base = match.group(1)
-                    suffix = match.group(2) if match.group(2) else ""
-                    transliterated_base = transliterate_text(symbol_base, char_map)
-                    new_key_part = f"{transliterated_base}{suffix}"
-                    new_lines.append(f"{new_key_part} {sentence_part}")
-                else:
-                    new_lines.append(line)
-            else:
-                new_lines.append(line)
-
-        with open(tts_path, 'w', encoding='utf-8') as f:
-            f.writelines(new_lines)
-        print(f"  Updated keys in {tts_path}")
+        rewrite_tts_file(tts_path, transliterate, dry_run)
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python transliterate_symbols.py <lang_code1> [<lang_code2> ...]")
-        sys.exit(1)
+def benchmark(repeat=5):
+    """Time the compiled tables against ``transliterate_text`` on every locale
+    string, and report any string where the two disagree."""
+    locales_dir = Path(__file__).parent.parent / "frontend" / "static" / "locales"
+    strings = []
+    for locale_path in sorted(locales_dir.glob("*.json")):
+        with open(locale_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for key, value in data.items():
+            strings.append(key)
+            strings.extend(value if isinstance(value, list) else [value])
+    strings = [s for s in strings if isinstance(s, str)]
+    print(f"{len(strings)} strings from {locales_dir}")
+
+    print(f"{'lang':<6}{'loop ms':>10}{'table ms':>10}{'speedup':>9}{'differ':>8}")
+    for code, char_map in language_transliteration_maps.items():
+        transliterate = TRANSLITERATORS[code]
+        loop = min(timeit.repeat(lambda: [transliterate_text(s, char_map) for s in strings], number=1, repeat=repeat))
+        table = min(timeit.repeat(lambda: [transliterate(s) for s in strings], number=1, repeat=repeat))
+        differ = [(s, transliterate_text(s, char_map), transliterate(s))
+                  for s in strings if transliterate_text(s, char_map) != transliterate(s)]
+        print(f"{code:<6}{loop * 1000:>10.2f}{table * 1000:>10.2f}{loop / table:>8.1f}x{len(differ):>8}")
+        # Only the upper-case digraph rule should make the results differ.
+        for s, old, new in differ[:3]:
+            print(f"        {s!r}: {old!r} -> {new!r}")
+
 
-    for lang_code in sys.argv[1:]:
-        if lang_code in language_transliteration_maps:
+def main():
+    """
+    Transliterates the symbol names of a language to ASCII: renames its symbol
+    images and MP3s and rewrites the keys in its locale and TTS text files.
+    """
+    parser = argparse.ArgumentParser(description="Transliterate symbol names to ASCII.")
+    parser.add_argument("lang_codes", nargs="*", metavar="lang_code",
+                        help=f"Languages to process: {', '.join(language_transliteration_maps)}")
+    parser.add_argument("--dry-run", action="store_true", help="Print the planned changes without making them")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Compare the compiled tables with the per-character loop on all locales")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark()
+        return
+    if not args.lang_codes:
+        parser.error("at least one lang_code is required")
+
+    for lang_code in args.lang_codes:
+        if lang_code in TRANSLITERATORS:
             print(f"Processing language: {lang_code}")
-            char_map = language_transliteration_maps[lang_code]
-            process_language(lang_code, char_map)
+            process_language(lang_code, TRANSLITERATORS[lang_code], dry_run=args.dry_run)
         else:
             print(f"Error: No transliteration map defined for language code '{lang_code}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,117 +1,715 @@
 from flask import Flask, jsonify, session, send_from_directory, request
 from flask_cors import CORS
-import random
+from werkzeug.security import safe_join
+from werkzeug.wsgi import FileWrapper
 from pathlib import Path
 from functools import wraps
+import gzip
+import hashlib
 import json
+import logging
+import mimetypes
+import os
 import re
+import secrets
+import threading
+import time
+import uuid
+from typing import NamedTuple
+
+try:
+    from . import metrics
+    from .asset_packs import get_archive
+    from .blocking import offload
+    from .game_token import GameToken, GameTokens
+    from .highscores import create_highscores
+    from .rounds import RoundPlan, new_seed, plan_deck, plan_game
+except ImportError:  # running as ``python backend/app.py``
+    import metrics
+    from asset_packs import get_archive
+    from blocking import offload
+    from game_token import GameToken, GameTokens
+    from highscores import create_highscores
+    from rounds import RoundPlan, new_seed, plan_deck, plan_game
+
+logger = logging.getLogger(__name__)
+
+
+def _secret_key() -> str:
+    """Return ``SECRET_KEY`` from the environment.
+
+    The key signs the session cookie and game tokens, so every worker and
+    host serving the app must use the same one. Only the development server
+    (``python backend/app.py`` or ``FLASK_DEBUG=1``) falls back to a random key.
+    """
+    key = os.environ.get("SECRET_KEY")
+    if key:
+        return key
+    if __name__ != "__main__" and os.environ.get("FLASK_DEBUG", "0") in ("", "0", "false"):
+        raise RuntimeError("SECRET_KEY is not set. Set it to the same random value for every "
+                           "worker and host, e.g. SECRET_KEY=$(openssl rand -hex 32)")
+    logger.warning("SECRET_KEY is not set; using a random key, so sessions and games "
+                   "do not survive a restart")
+    return secrets.token_hex(32)
+
 
 # Serve static assets (CSS, JS, images) under the "/static" URL prefix.
 app = Flask(__name__, static_folder="../frontend", static_url_path="")
-app.secret_key = "replace-this-secret"
+app.secret_key = _secret_key()
 # Allow CORS for development; in production restrict origins.
 CORS(app)
+# Request timing and ``/metrics`` when ``METRICS=1`` (see ``metrics.py``).
+metrics.init_app(app)
+
+ROUNDS_PER_GAME = 10
+
+# Games in progress live in signed tokens held by the client (see ``game_token.py``).
+game_tokens = GameTokens(app.secret_key)
+
+# High scores, shared by all workers (see ``highscores.py``).
+highscores = create_highscores()
 
 # ---------------------------------------------------------------------------
-# Highscore persistence (simple file based).
+# Dynamically build the symbol-image list from files in ``frontend/static``.
 # ---------------------------------------------------------------------------
-HIGH_SCORE_FILE = Path(__file__).parent / "highscore.txt"
+STATIC_DIR = Path(app.static_folder) / "static"
+SYMBOLS_DIR = STATIC_DIR / "symbols"
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif"}
+# Written by ``tools/build_manifest.py``; maps static paths to hashed ones.
+MANIFEST_PATH = STATIC_DIR / "manifest.json"
+# Written by ``add_new_language/optimize_images.py``; resized WebP/PNG variants.
+VARIANTS_INDEX_PATH = STATIC_DIR / "variants" / "index.json"
+# Written by ``add_new_language/optimize_audio.py``; trimmed Opus/mp3 sentence audio.
+AUDIO_VARIANTS_PATH = STATIC_DIR / "variants" / "audio.json"
+# Written by ``tools/pack_assets.py``; one archive per language, plus ``common``.
+PACKS_DIR = STATIC_DIR / "packs"
+# ``symbols/pl/a.<hash>.png`` -> (``symbols/pl/a``, ``.png``)
+_HASHED_NAME_RE = re.compile(r"(.+)\.[0-9a-f]{10}(\.[^./]+)?")
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
 
 
-def _load_highscore() -> int:
-    try:
-        return int(HIGH_SCORE_FILE.read_text().strip())
-    except Exception:
-        return 0
+def asset_url(path: str, manifest: dict = None) -> str:
+    """Map a ``/static/...`` URL to its content-hashed form, if fingerprinted.
 
+    Without a manifest (e.g. in development) the plain URL is returned.
+    """
+    if manifest is None:
+        manifest = get_asset_manifest()
+    hashed = manifest.get(path[len("/static/"):])
+    return f"/static/{hashed}" if hashed else path
 
-def _save_highscore(score: int) -> None:
-    HIGH_SCORE_FILE.write_text(str(score))
 
-# ---------------------------------------------------------------------------
-# Dynamically build the symbol-image list from files in ``frontend/static``.
-# ---------------------------------------------------------------------------
+def image_sources(path: str, manifest: dict, variants: dict):
+    """Return ``srcset`` strings for the WebP and PNG variants of an image.
+
+    ``None`` when ``optimize_images.py`` has not produced variants for it.
+    """
+    entries = variants.get(path[len("/static/"):])
+    if not entries:
+        return None
+    return {
+        kind: ", ".join(f"{asset_url('/static/' + e[kind], manifest)} {e['width']}w" for e in entries)
+        for kind in ("webp", "png")
+    }
+
+
+def audio_sources(path: str, manifest: dict, variants: dict) -> dict:
+    """Return the ``audio`` URL of a sentence and, if available, ``audio_opus``.
 
+    When ``optimize_audio.py`` has processed the file, ``audio`` is its
+    trimmed mp3 and ``audio_opus`` the smaller Opus encoding.
+    """
+    entry = variants.get(path[len("/static/"):])
+    if not entry:
+        return {"audio": asset_url(path, manifest)}
+    return {
+        "audio": asset_url("/static/" + entry["mp3"], manifest),
+        "audio_opus": asset_url("/static/" + entry["opus"], manifest),
+    }
 
+
+def _symbol_entry(symbol: str, path: str, manifest: dict, variants: dict) -> dict:
+    entry = {"symbol": symbol, "image": asset_url(path, manifest)}
+    sources = image_sources(path, manifest, variants)
+    if sources:
+        entry["sources"] = sources
+    return entry
+
+
+@metrics.timed("load_symbol_image_list")
 def _load_symbol_image_list(lang: str = 'en') -> list:
     """Scan ``frontend/static/symbols`` for image files and return a list of dicts."""
     result = []
+    manifest = get_asset_manifest()
+    variants = get_image_variants()
 
     # Always load common symbols
-    common_static_dir = Path(app.static_folder) / "static" / "symbols" / "common"
+    # Sorted, so the indices in game tokens mean the same on every host.
+    common_static_dir = SYMBOLS_DIR / "common"
     if common_static_dir.is_dir():
-        for p in common_static_dir.iterdir():
-            if p.suffix.lower() not in {".png", ".jpg", ".jpeg", ".gif"}:
+        for p in sorted(common_static_dir.iterdir()):
+            if p.suffix.lower() not in IMAGE_SUFFIXES:
                 continue
             symbol = p.stem.lower()
-            result.append({"symbol": symbol, "image": f"/static/symbols/common/{p.name}"})
+            result.append(_symbol_entry(symbol, f"/static/symbols/common/{p.name}", manifest, variants))
 
     # Load language-specific symbols
-    lang_static_dir = Path(app.static_folder) / "static" / "symbols" / lang
+    lang_static_dir = SYMBOLS_DIR / lang
     if lang_static_dir.is_dir():
-        for p in lang_static_dir.iterdir():
-            if p.suffix.lower() not in {".png", ".jpg", ".jpeg", ".gif"}:
+        for p in sorted(lang_static_dir.iterdir()):
+            if p.suffix.lower() not in IMAGE_SUFFIXES:
                 continue
             symbol = p.stem.lower()
-            result.append({"symbol": symbol, "image": f"/static/symbols/{lang}/{p.name}"})
+            result.append(_symbol_entry(symbol, f"/static/symbols/{lang}/{p.name}", manifest, variants))
 
     return result
 
 
-def _load_polish_sentence_data() -> list:
-    """Load Polish sentence data."""
-    result = []
+class SentenceCard(NamedTuple):
+    """One round of sentence mode: a sentence and its three candidate images."""
+    sentence_key: str
+    sentence: str
+    options: tuple
+    correct: str
+    audio: str
+    audio_opus: str  # None until optimize_audio.py has processed the audio
+    sources: dict  # option URL -> srcset strings, for options that have variants
 
-    # Load sentences from pl.json
-    locales_dir = Path(app.static_folder) / "static" / "locales"
-    pl_json_path = locales_dir / "pl.json"
-    if not pl_json_path.exists():
-        return []
 
-    with open(pl_json_path, 'r', encoding='utf-8') as f:
-        pl_data = json.load(f)
+_SENTENCE_IMAGE_RE = re.compile(r"sentence(\d+)_(\w+)")
+# Language codes are used in file paths, so only accept plain codes.
+_LANG_RE = re.compile(r"[A-Za-z]{2,3}(?:[-_][A-Za-z0-9]{2,8})?")
 
-    # Load images
-    lang_static_dir = Path(app.static_folder) / "static" / "symbols" / "pl"
+
+@metrics.timed("load_sentence_data")
+def _load_sentence_data(lang: str) -> list:
+    """Pair the ``sentence_<n>`` locale strings of ``lang`` with their images.
+
+    A language offers sentence mode when ``symbols/<lang>`` contains
+    ``sentence<n>_right``, ``sentence<n>_wrong_a`` and ``sentence<n>_wrong_b``
+    images for sentences defined in its locale file.
+    """
+    lang_static_dir = SYMBOLS_DIR / lang
     if not lang_static_dir.is_dir():
         return []
 
+    manifest = get_asset_manifest()
+    variants = get_image_variants()
+    audio_variants = get_audio_variants()
     images_by_sentence = {}
     for p in lang_static_dir.iterdir():
-        if p.suffix.lower() not in {".png", ".jpg", ".jpeg", ".gif"}:
+        if p.suffix.lower() not in IMAGE_SUFFIXES:
             continue
 
-        match = re.match(r"sentence(\d+)_(\w+)", p.stem)
+        match = _SENTENCE_IMAGE_RE.match(p.stem)
         if match:
-            sentence_num = match.group(1)
+            sentence_num = int(match.group(1))
             image_type = match.group(2)
+            images_by_sentence.setdefault(sentence_num, {})[image_type] = f"/static/symbols/{lang}/{p.name}"
 
-            if sentence_num not in images_by_sentence:
-                images_by_sentence[sentence_num] = {}
-
-            images_by_sentence[sentence_num][image_type] = f"/static/symbols/pl/{p.name}"
+    if not images_by_sentence:
+        return []
 
-    for num, images in images_by_sentence.items():
+    locale_data = get_locale(lang)
+    result = []
+    for num in sorted(images_by_sentence):
+        images = images_by_sentence[num]
         sentence_key = f"sentence_{num}"
-        if sentence_key in pl_data and "right" in images and "wrong_a" in images and "wrong_b" in images:
-            result.append({
-                "sentence_key": sentence_key,
-                "sentence": pl_data[sentence_key],
-                "options": [images["right"], images["wrong_a"], images["wrong_b"]],
-                "correct": images["right"],
-            })
+        if sentence_key in locale_data and "right" in images and "wrong_a" in images and "wrong_b" in images:
+            paths = (images["right"], images["wrong_a"], images["wrong_b"])
+            sources = {}
+            for path in paths:
+                srcset = image_sources(path, manifest, variants)
+                if srcset:
+                    sources[asset_url(path, manifest)] = srcset
+            audio = audio_sources(f"/static/mp3s/{lang}/{sentence_key}.mp3", manifest, audio_variants)
+            result.append(SentenceCard(
+                sentence_key=sentence_key,
+                sentence=locale_data[sentence_key],
+                options=tuple(asset_url(path, manifest) for path in paths),
+                correct=asset_url(images["right"], manifest),
+                audio=audio["audio"],
+                audio_opus=audio.get("audio_opus"),
+                sources=sources,
+            ))
 
     return result
 
 
+# ---------------------------------------------------------------------------
+# Per-language caches, built once per worker.
+#
+# Each entry is keyed by language and remembers the mtimes of the files and
+# directories it was built from. Adding, removing or renaming a file bumps the
+# directory mtime, so the next request rebuilds that language only.
+# ``/admin/reload`` drops everything explicitly.
+# ---------------------------------------------------------------------------
+_catalog_cache = {}
+_deck_cache = {}
+_locale_cache = {}
+_manifest_cache = {}
+_variants_cache = {}
+_audio_variants_cache = {}
+_languages_cache = {}
+_index_cache = {}
+_version_cache = {}
+_pack_cache = {}
+# Re-entrant because building a deck reads the (cached) locale.
+_cache_lock = threading.RLock()
+
+
+def _mtime(path: Path):
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _cached(cache: dict, key, stamp, build):
+    entry = cache.get(key)
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+
+    with _cache_lock:
+        entry = cache.get(key)
+        if entry is None or entry[0] != stamp:
+            entry = (stamp, build())
+            cache[key] = entry
+    return entry[1]
+
+
+@offload
+def _read_json(path: Path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def get_asset_manifest() -> dict:
+    """Return the cached static asset manifest; empty if it was never built."""
+    manifest_mtime = _mtime(MANIFEST_PATH)
+    if manifest_mtime is None:
+        return {}
+
+    return _cached(_manifest_cache, None, manifest_mtime,
+                   lambda: _read_json(MANIFEST_PATH)["files"])
+
+
+def get_image_variants() -> dict:
+    """Return the cached image variants index; empty if it was never built."""
+    index_mtime = _mtime(VARIANTS_INDEX_PATH)
+    if index_mtime is None:
+        return {}
+
+    return _cached(_variants_cache, None, index_mtime,
+                   lambda: _read_json(VARIANTS_INDEX_PATH))
+
+
+def get_audio_variants() -> dict:
+    """Return the cached audio variants index; empty if it was never built."""
+    index_mtime = _mtime(AUDIO_VARIANTS_PATH)
+    if index_mtime is None:
+        return {}
+
+    return _cached(_audio_variants_cache, None, index_mtime,
+                   lambda: _read_json(AUDIO_VARIANTS_PATH))
+
+
+def _build_outputs_stamp() -> tuple:
+    """Mtimes of the build outputs that the catalogs and decks embed."""
+    return _mtime(MANIFEST_PATH), _mtime(VARIANTS_INDEX_PATH), _mtime(AUDIO_VARIANTS_PATH)
+
+
+def _symbol_catalog_key(lang: str) -> tuple:
+    """Return the cache key and stamp of the symbol catalog of ``lang``."""
+    common_mtime = _mtime(SYMBOLS_DIR / "common")
+    lang_mtime = _mtime(SYMBOLS_DIR / lang)
+    # Unknown languages only see the common symbols; share a single entry for
+    # them so arbitrary ``lang`` values cannot grow the cache.
+    key = lang if lang_mtime is not None else None
+    return key, (common_mtime, lang_mtime) + _build_outputs_stamp()
+
+
+def get_symbol_catalog(lang: str = 'en') -> tuple:
+    """Return the cached symbol catalog for ``lang``, rebuilding it if stale."""
+    key, stamp = _symbol_catalog_key(lang)
+    return _cached(_catalog_cache, key, stamp,
+                   lambda: tuple(_load_symbol_image_list(lang)))
+
+
+def get_locale(lang: str) -> dict:
+    """Return the cached ``locales/<lang>.json`` contents; empty if missing."""
+    locale_mtime = _mtime(STATIC_DIR / "locales" / f"{lang}.json")
+    if locale_mtime is None:
+        return {}
+
+    return _cached(_locale_cache, lang, locale_mtime,
+                   lambda: _read_json(STATIC_DIR / "locales" / f"{lang}.json"))
+
+
+def _sentence_deck_stamp(lang: str):
+    """Return the cache stamp of the sentence deck of ``lang``; ``None`` if it
+    cannot have one."""
+    locale_mtime = _mtime(STATIC_DIR / "locales" / f"{lang}.json")
+    lang_mtime = _mtime(SYMBOLS_DIR / lang)
+    if locale_mtime is None or lang_mtime is None:
+        return None
+    return (locale_mtime, lang_mtime) + _build_outputs_stamp()
+
+
+def get_sentence_deck(lang: str) -> tuple:
+    """Return the cached sentence deck for ``lang``; empty if it has none."""
+    stamp = _sentence_deck_stamp(lang)
+    if stamp is None:
+        return ()
+    return _cached(_deck_cache, lang, stamp,
+                   lambda: tuple(_load_sentence_data(lang)))
+
+
+def _catalog_version(names) -> str:
+    return hashlib.sha1("\n".join(names).encode('utf-8')).hexdigest()[:10]
+
+
+def get_game_catalog(lang: str) -> tuple:
+    """Return ``(deck, symbols, version)`` for a game in ``lang``.
+
+    ``deck`` is the sentence deck, and ``symbols`` the symbol catalog when the
+    language has no deck. ``version`` hashes what a round plan indexes into, so
+    a game token from a host with other files is recognised.
+    """
+    deck = get_sentence_deck(lang)
+    if deck:
+        stamp = ("sentence",) + _sentence_deck_stamp(lang)
+        return deck, (), _cached(_version_cache, lang, stamp,
+                                 lambda: _catalog_version(card.sentence_key for card in deck))
+
+    key, stamp = _symbol_catalog_key(lang)
+    symbols = get_symbol_catalog(lang)
+    return (), symbols, _cached(_version_cache, key, ("symbol",) + stamp,
+                                lambda: _catalog_version(symbol["symbol"] for symbol in symbols))
+
+
+# Endonyms shown on the language page; other codes fall back to the code.
+LANGUAGE_NAMES = {
+    "en": "English",
+    "hu": "Magyar",
+    "mk": "Македонски",
+    "pl": "Polski",
+    "sk": "Slovenčina",
+    "sr": "Српски",
+}
+
+
+def _flag_codes() -> dict:
+    """Map lang_code -> flag file name for ``frontend/static/langs``."""
+    try:
+        names = os.listdir(STATIC_DIR / "langs")
+    except OSError:
+        return {}
+    # 'us.svg' is the English flag
+    return {('en' if name[:-4] == 'us' else name[:-4]): name for name in names if name.endswith(".svg")}
+
+
+def _load_language_list() -> list:
+    """Describe every language that has a flag in ``frontend/static/langs``."""
+    manifest = get_asset_manifest()
+    languages = []
+    for lang_code, flag in _flag_codes().items():
+        deck = get_sentence_deck(lang_code)
+        languages.append({
+            "code": lang_code,
+            "name": LANGUAGE_NAMES.get(lang_code, lang_code),
+            "flag": asset_url(f"/static/langs/{flag}", manifest),
+            "sentence_mode": bool(deck),
+            "symbols": len(deck) if deck else len(get_symbol_catalog(lang_code)),
+        })
+
+    languages.sort(key=lambda language: language["code"])
+    return languages
+
+
+def get_language_list() -> tuple:
+    """Return the cached ``(languages, etag)`` pair for ``/api/languages``.
+
+    Besides the flag directory, the entry depends on the symbol directory and
+    locale file of every listed language, so all of those are part of its
+    stamp.
+    """
+    codes = sorted(_flag_codes())
+    stamp = (_mtime(STATIC_DIR / "langs"), _mtime(SYMBOLS_DIR / "common")) + tuple(
+        (_mtime(SYMBOLS_DIR / code), _mtime(STATIC_DIR / "locales" / f"{code}.json")) for code in codes
+    ) + _build_outputs_stamp()
+
+    def build():
+        languages = _load_language_list()
+        body = json.dumps(languages, ensure_ascii=False, sort_keys=True)
+        return languages, hashlib.sha1(body.encode('utf-8')).hexdigest()
+    return _cached(_languages_cache, None, stamp, build)
+
+
+def warm_caches() -> dict:
+    """Build the language list and every language's locale and deck (or
+    symbol catalog) now rather than on first use.
+
+    ``gunicorn.conf.py`` calls this in the master before it forks, so every
+    worker starts with the caches filled and shares their memory
+    copy-on-write. Returns figures for the startup report.
+    """
+    start = time.perf_counter()
+    get_asset_manifest()
+    get_image_variants()
+    get_audio_variants()
+    languages, _ = get_language_list()
+    decks = catalogs = 0
+    for language in languages:
+        code = language["code"]
+        get_locale(code)
+        get_index_page(code)
+        if get_sentence_deck(code):
+            decks += 1
+        else:
+            get_symbol_catalog(code)
+            catalogs += 1
+    return {
+        "languages": len(languages),
+        "sentence_decks": decks,
+        "symbol_catalogs": catalogs,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def clear_caches() -> None:
+    """Forget every cached catalog so the next request rescans the disk."""
+    with _cache_lock:
+        _catalog_cache.clear()
+        _deck_cache.clear()
+        _locale_cache.clear()
+        _manifest_cache.clear()
+        _variants_cache.clear()
+        _audio_variants_cache.clear()
+        _languages_cache.clear()
+        _index_cache.clear()
+        _version_cache.clear()
+        _pack_cache.clear()
+
+
+# Written next to text assets by ``tools/compress_static.py``, best first.
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+def send_static(directory, filename: str, **kwargs):
+    """``send_from_directory`` that prefers a precompressed sibling.
+
+    nginx does the same with ``gzip_static``/``brotli_static``; this covers
+    requests that reach Flask directly.
+    """
+    accepted = request.accept_encodings
+    path = safe_join(str(directory), filename)
+    source_mtime = _mtime(Path(path)) if path else None
+    candidates = PRECOMPRESSED if source_mtime is not None else ()
+    for encoding, suffix in candidates:
+        # Skip siblings older than the file, e.g. after editing it in development.
+        if accepted[encoding] and (_mtime(Path(path + suffix)) or 0) >= source_mtime:
+            mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            response = send_from_directory(directory, filename + suffix, mimetype=mimetype,
+                                           download_name=Path(filename).name, **kwargs)
+            response.content_encoding = encoding
+            break
+    else:
+        response = send_from_directory(directory, filename, **kwargs)
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+# The page shell; ``get_index_page`` renders it once per language.
+INDEX_PATH = Path(app.static_folder) / "index.html"
+# Written by ``tools/split_locales.py``; the full locale file works too.
+UI_LOCALES_DIR = STATIC_DIR / "locales" / "ui"
+
+
+def get_ui_strings(lang: str) -> dict:
+    """Return the cached UI bundle of ``lang``; the full locale if not split."""
+    ui_mtime = _mtime(UI_LOCALES_DIR / f"{lang}.json")
+    if ui_mtime is None:
+        return get_locale(lang)
+
+    return _cached(_locale_cache, ("ui", lang), ui_mtime,
+                   lambda: _read_json(UI_LOCALES_DIR / f"{lang}.json"))
+
+
+def _script_json(data) -> str:
+    """Serialize ``data`` so it can sit inside a ``<script>`` element."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).replace("<", "\\u003c")
+
+
+@offload
+def get_index_page(lang: str) -> tuple:
+    """Return the cached ``(head, tail, etag)`` of ``index.html`` for ``lang``.
+
+    The page carries a ``<script id="bootstrap">`` JSON object with the
+    language, the language list and the UI strings, so the app can render
+    without asking for them. The object is left open after a trailing
+    ``"highscore":`` key: the caller writes the per-player high scores
+    between ``head`` and ``tail``.
+    """
+    ui_stamp = (_mtime(UI_LOCALES_DIR / f"{lang}.json"), _mtime(STATIC_DIR / "locales" / f"{lang}.json"))
+    if ui_stamp == (None, None) and lang != 'en':
+        # Unknown languages get the English page, so they cannot grow the cache.
+        return get_index_page('en')
+    languages, languages_etag = get_language_list()
+    stamp = (_mtime(INDEX_PATH), languages_etag) + ui_stamp
+
+    def build():
+        data = {"lang": lang, "languages": languages, "ui": get_ui_strings(lang)}
+        template = INDEX_PATH.read_text(encoding='utf-8').replace('<html lang="en">', f'<html lang="{lang}">', 1)
+        before, script, after = template.rpartition('<script src="/app.js">')
+        head = f'{before}<script id="bootstrap" type="application/json">{_script_json(data)[:-1]},"highscore":'
+        tail = f'}}</script>\n  {script}{after}'
+        etag = hashlib.sha1((head + tail).encode('utf-8')).hexdigest()
+        return head, tail, etag
+    return _cached(_index_cache, lang, stamp, build)
+
+
+def render_index():
+    """Serve ``index.html`` with the bootstrap data of the session language.
+
+    The rendered page is revalidated with an ETag on every visit, so an
+    unchanged page costs a 304 like the static file did. It is gzipped here,
+    as there is no precompressed copy for ``send_static`` or nginx to send.
+    """
+    lang = session.get('lang', 'en')
+    if not _LANG_RE.fullmatch(lang):
+        lang = 'en'
+    head, tail, etag = get_index_page(lang)
+    scores = _highscore_data(lang)
+    etag = f"{etag}-{scores['highscore']}-{scores['lang_highscore']}-{scores['session_highscore']}"
+    body = (head + _script_json(scores) + tail).encode('utf-8')
+    response = app.response_class(body, mimetype="text/html")
+    if request.accept_encodings["gzip"]:
+        response.set_data(gzip.compress(body, compresslevel=6, mtime=0))
+        response.content_encoding = "gzip"
+        etag += "-gz"
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    response.vary.add("Cookie")
+    response.vary.add("Accept-Encoding")
+    return response.make_conditional(request)
+
+
+# ``src``/``href`` of the scripts, styles and icon that index.html loads.
+_SHELL_URL_RE = re.compile(r'<(?:script|link)\b[^>]*?\b(?:src|href)="([^"]+)"')
+
+
+def _url_revision(url: str):
+    """Identify the content at ``url`` for language pack updates.
+
+    Content-hashed URLs are their own revision; other local files use their
+    size and mtime, and other origins (the React CDN) their URL. ``None``
+    if the local file does not exist.
+    """
+    if not url.startswith("/"):
+        return url
+    path = Path(app.static_folder) / url.split("?", 1)[0].lstrip("/")
+    try:
+        st = path.stat()
+    except OSError:
+        match = _HASHED_NAME_RE.fullmatch(url[len("/static/"):]) if url.startswith("/static/") else None
+        return url if match and get_asset_manifest().get(match.group(1) + (match.group(2) or "")) else None
+    return f"{st.st_size:x}-{st.st_mtime_ns:x}"
+
+
+def _pack_symbols(lang: str, symbols: tuple) -> list:
+    """Symbol catalog entries with the sentences ``/api/game`` cycles through."""
+    locale = get_locale(lang)
+    manifest = get_asset_manifest()
+    audio_variants = get_audio_variants()
+    entries = []
+    for symbol in symbols:
+        name = symbol["symbol"]
+        sentences = locale.get(f"{name}_sentences")
+        if isinstance(sentences, list) and sentences:
+            lines = []
+            for index, text in enumerate(sentences):
+                audio = audio_sources(f"/static/mp3s/{lang}/{name}_{index + 1}.mp3", manifest, audio_variants)
+                if not _url_revision(audio["audio"]):
+                    lines.append([text, None, None])
+                else:
+                    lines.append([text, audio["audio"], audio.get("audio_opus")])
+        else:
+            lines = [[locale.get(name, name), None, None]]
+        entries.append({"symbol": name, "image": symbol["image"], "sentences": lines})
+    return entries
+
+
+def _build_language_pack(lang: str) -> tuple:
+    deck, symbols, version = get_game_catalog(lang)
+    languages, _ = get_language_list()
+    if deck:
+        content = {"mode": "sentence", "deck": [{
+            "sentence_key": card.sentence_key,
+            "sentence": card.sentence,
+            "options": card.options,
+            "correct": card.correct,
+            "audio": card.audio if _url_revision(card.audio) else None,
+            "audio_opus": card.audio_opus if _url_revision(card.audio) else None,
+        } for card in deck]}
+        urls = [url for card in deck for url in card.options + (card.audio, card.audio_opus)]
+    else:
+        content = {"mode": "symbol", "symbols": _pack_symbols(lang, symbols)}
+        urls = [entry["image"] for entry in content["symbols"]]
+        urls += [url for entry in content["symbols"] for line in entry["sentences"] for url in line[1:]]
+
+    template = INDEX_PATH.read_text(encoding='utf-8')
+    urls += _SHELL_URL_RE.findall(template)
+    urls += [language["flag"] for language in languages]
+    # The plain flag URL is what the game header shows.
+    urls.append(f"/static/langs/{'us' if lang == 'en' else lang}.svg")
+    urls += [f"/static/mp3s/{p.name}" for p in sorted((STATIC_DIR / "mp3s").glob("*.mp3"))]
+    urls += [f"/static/locales/ui/{lang}.json", f"/static/locales/sentences/{lang}.json"]
+
+    files = {}
+    for url in urls:
+        if url and url not in files:
+            revision = _url_revision(url)
+            if revision is not None:
+                files[url] = revision
+    # The page itself, rendered for this language; see ``render_index``.
+    files[f"/?lang={lang}"] = get_index_page(lang)[2]
+
+    pack = {"lang": lang, "rounds": ROUNDS_PER_GAME, "catalog_version": version, **content, "files": files}
+    body = json.dumps(pack, ensure_ascii=False, sort_keys=True)
+    return body, hashlib.sha1(body.encode('utf-8')).hexdigest()
+
+
+@offload
+def get_language_pack(lang: str) -> tuple:
+    """Return the cached ``(json body, etag)`` of the offline pack of ``lang``.
+
+    A pack holds everything a game in ``lang`` needs without the backend:
+    the sentence deck or symbol catalog with its sentences, and a
+    ``files`` map from every URL to precache to its revision, so that an
+    installed pack only downloads the files whose revision changed.
+    """
+    stamp = (
+        _symbol_catalog_key(lang)[1],
+        _sentence_deck_stamp(lang),
+        _mtime(INDEX_PATH),
+        _mtime(Path(app.static_folder) / "app.js"),
+        _mtime(STATIC_DIR / "mp3s"),
+        _mtime(STATIC_DIR / "mp3s" / lang),
+        _mtime(UI_LOCALES_DIR / f"{lang}.json"),
+        get_language_list()[1],
+    )
+    return _cached(_pack_cache, lang, stamp, lambda: _build_language_pack(lang))
+
+
 def set_language(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         lang = request.args.get('lang')
-        print(f"ROUTE: {request.path}, lang={lang}, session={session}")
-        if lang:
+        # Only a changed session is sent back as a new cookie.
+        if lang and session.get('lang') != lang:
             session['lang'] = lang
-            print(f"ROUTE: {request.path}, session after set={session}")
+            logger.debug("%s: set lang=%s", request.path, lang)
         return f(*args, **kwargs)
     return decorated_function
 
@@ -120,27 +718,51 @@ def set_language(f):
 @set_language
 def index():
     """Serve the main application page."""
-    return send_from_directory(app.static_folder, 'index.html')
+    return render_index()
 
 
 @app.route('/language')
 @set_language
 def language_page():
     """Serve the main application page."""
-    return send_from_directory(app.static_folder, 'index.html')
+    return render_index()
 
 
 @app.route('/game')
 @set_language
 def game_page():
     """Serve the main application page."""
-    return send_from_directory(app.static_folder, 'index.html')
+    return render_index()
+
+
+@app.route('/static/<path:filename>')
+def static_asset(filename):
+    """Serve ``frontend/static`` when nginx is bypassed.
+
+    Content-hashed URLs from the manifest never change, so they are cached
+    for a year; everything else is revalidated on each use.
+    """
+    match = _HASHED_NAME_RE.fullmatch(filename)
+    if match and not (STATIC_DIR / filename).is_file():
+        original = match.group(1) + (match.group(2) or "")
+        if get_asset_manifest().get(original) == filename:
+            response = send_static(STATIC_DIR, original, max_age=IMMUTABLE_MAX_AGE)
+            response.cache_control.immutable = True
+            return response
+        # Outdated hash: serve the current file, but do not pin it.
+        filename = original
+    return send_static(STATIC_DIR, filename)
+
+
+# Flask's own static route serves the rest of ``frontend`` (``/app.js``).
+app.view_functions["static"] = lambda filename: send_static(app.static_folder, filename)
 
 
 @app.route('/api/set_lang/<lang>')
 def set_lang_api(lang):
-    session['lang'] = lang
-    print(f"API/SET_LANG: session after set={session}")
+    if session.get('lang') != lang:
+        session['lang'] = lang
+        logger.debug("set_lang: lang=%s", lang)
     return jsonify({"success": True})
 
 
@@ -152,108 +774,294 @@ def get_lang_api():
 
 @app.route('/api/languages')
 def get_languages():
-    """Return a list of available languages, sorted alphabetically."""
-    langs_dir = Path(app.static_folder) / "static" / "langs"
-    all_languages = []
-    if langs_dir.is_dir():
-        for f in langs_dir.glob("*.svg"):
-            lang_code = f.stem
-            if lang_code == 'us':  # Convert 'us.svg' to 'en' language code
-                all_languages.append('en')
-            else:
-                all_languages.append(lang_code)
+    """Return the codes of the available languages, sorted.
+
+    With ``?details=1`` each language is an object with its code, display
+    name, flag URL, whether it plays in sentence mode and how many symbols or
+    sentences it has. The plain list is what older clients expect.
+    """
+    languages, etag = get_language_list()
+    if request.args.get('details'):
+        response = jsonify(languages)
+    else:
+        response = jsonify([language["code"] for language in languages])
+        etag += "-codes"
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
-    all_languages.sort()  # Sort all languages alphabetically
-    languages = all_languages  # No special handling for 'en'
 
-    return jsonify(languages)
+@app.route('/api/pack/<lang>')
+def language_pack(lang):
+    """Return the offline pack of ``lang`` (see ``get_language_pack``)."""
+    if lang not in {language["code"] for language in get_language_list()[0]}:
+        return jsonify({"error": f"Unknown language: {lang}"}), 404
+    body, etag = get_language_pack(lang)
+    response = app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def _get_pack_archive(name: str):
+    if not _LANG_RE.fullmatch(name) and name != "common":
+        return None
+    return get_archive(PACKS_DIR / f"{name}.pack")
+
+
+@app.route('/api/assets/<name>')
+def asset_archive_index(name):
+    """Return the URL of the ``name`` archive and where each member sits in it,
+    so a client can fetch the whole archive in one request and slice it."""
+    archive = _get_pack_archive(name)
+    if archive is None:
+        return jsonify({"error": f"No asset archive for {name}"}), 404
+    return jsonify({
+        "archive": asset_url(f"/static/packs/{name}.pack"),
+        "members": {path: list(member) for path, member in archive.members.items()},
+    })
+
+
+@app.route('/api/assets/<name>/<path:member>')
+def asset_archive_member(name, member):
+    """Serve one file, e.g. ``symbols/pl/a.png``, out of the ``name`` archive.
+
+    Supports ``Range`` and conditional requests like a plain static file.
+    """
+    archive = _get_pack_archive(name)
+    if archive is None or member not in archive.members:
+        return jsonify({"error": f"{member} is not in the {name} archive"}), 404
+    entry = archive.members[member]
+    response = app.response_class(
+        FileWrapper(archive.open(member), 1 << 16),
+        mimetype=mimetypes.guess_type(member)[0] or "application/octet-stream",
+        direct_passthrough=True,
+    )
+    response.content_length = entry.size
+    response.set_etag(entry.hash)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request, accept_ranges=True, complete_length=entry.size)
+
+
+def _sentence_round(card: SentenceCard, plan: RoundPlan) -> dict:
+    options = [card.options[i] for i in plan.options]
+    data = {
+        "sentence_key": card.sentence_key,
+        "sentence": card.sentence,
+        "options": options,
+        "correct": card.correct,
+        "audio": card.audio,
+        "finished": False,
+    }
+    if card.audio_opus:
+        data["audio_opus"] = card.audio_opus
+    if card.sources:
+        data["sources"] = card.sources
+    return data
+
+
+def _symbol_round(symbols: tuple, plan: RoundPlan) -> dict:
+    target = symbols[plan.target]
+    chosen = [symbols[i] for i in plan.options]
+    data = {
+        "symbol": target["symbol"],
+        "options": [p["image"] for p in chosen],
+        "correct": target["image"],
+        "finished": False,
+    }
+    sources = {p["image"]: p["sources"] for p in chosen if "sources" in p}
+    if sources:
+        data["sources"] = sources
+    return data
+
+
+def _not_enough_symbols():
+    return jsonify({
+        "error": "Not enough images in frontend/static/symbols/common (need ≥3)."
+        }), 500
+
+
+def _invalid_language(lang: str):
+    return jsonify({"error": f"Invalid language: {lang}"}), 400
+
+
+# Session key of the game token of clients that do not send it back.
+SESSION_GAME_KEY = 'game'
 
 
 @app.route('/api/next')
 def next_symbol():
-    """Return the next round data."""
-    round_num = session.get('round', 0)
-    if round_num >= 10:
-        session.pop('round', None)
-        session.pop('pl_sentences', None)
-        return jsonify({"finished": True})
+    """Return the next round data.
 
-    lang = session.get('lang', 'en')
-    print(f"API/NEXT: lang from session={lang}")
-
-    if lang == 'pl':
-        if 'pl_sentences' not in session:
-            sentences = _load_polish_sentence_data()
-            if not sentences:
-                return jsonify({"error": "No Polish sentence data found."}), 500
-            random.shuffle(sentences)
-            session['pl_sentences'] = sentences
-
-        pl_sentences = session['pl_sentences']
-        if round_num >= len(pl_sentences):
-            session.pop('round', None)
-            session.pop('pl_sentences', None)
-            return jsonify({"finished": True})
-
-        target = pl_sentences[round_num]
-        random.shuffle(target["options"])
-
-        session['round'] = round_num + 1
-
-        return jsonify({
-            "sentence_key": target["sentence_key"],
-            "sentence": target["sentence"],
-            "options": target["options"],
-            "correct": target["correct"],
-            "finished": False,
-        })
+    Without ``?token=`` this starts a new game in ``?lang=`` or the session
+    language. Every round carries the ``token`` that fetches the round after
+    it; nothing about the game is stored on the server.
 
+    Older clients send neither ``token`` nor ``lang`` and expect the server
+    to remember the round. For them the token is kept in the session cookie
+    instead, until the game finishes or ``/api/quit`` is called.
+    """
+    value = request.args.get('token')
+    in_session = not value and 'lang' not in request.args
+    if in_session:
+        lang = session.get('lang', 'en')
+        token = game_tokens.loads(session.get(SESSION_GAME_KEY, ""))
+        # A game in another language (or from another key) is abandoned.
+        if token is not None and token.lang != lang:
+            token = None
+    elif value:
+        token = game_tokens.loads(value)
+        if token is None or not _LANG_RE.fullmatch(token.lang):
+            return jsonify({"error": "Invalid game token"}), 400
+        lang = token.lang
     else:
-        symbols = _load_symbol_image_list(lang)
+        token = None
+        lang = request.args['lang']
+    if not _LANG_RE.fullmatch(lang):
+        return _invalid_language(lang)
 
+    deck, symbols, version = get_game_catalog(lang)
+    if token is not None and token.version != version:
+        if not in_session:
+            return jsonify({"error": "The game data has changed; start a new game."}), 409
+        token = None
+    if token is None:
+        token = GameToken(lang, new_seed(), 0, version)
+
+    if deck:
+        plan = plan_deck(len(deck), ROUNDS_PER_GAME, token.seed)
+        finished = token.round >= len(plan)
+        if not finished:
+            data = _sentence_round(deck[plan[token.round].target], plan[token.round])
+    else:
         if len(symbols) < 3:
-            return jsonify({
-                "error": "Not enough images in frontend/static/symbols/common (need ≥3)."
-                }), 500
-
-        target = random.choice(symbols)
-        distractors = random.sample([p for p in symbols if p != target], 2)
-        options = [target["image"]] + [d["image"] for d in distractors]
-        random.shuffle(options)
-
-        session['round'] = round_num + 1
-
-        return jsonify({
-            "symbol": target["symbol"],
-            "options": options,
-            "correct": target["image"],
-            "finished": False,
-        })
+            return _not_enough_symbols()
+        finished = token.round >= ROUNDS_PER_GAME
+        if not finished:
+            data = _symbol_round(symbols, plan_game(len(symbols), ROUNDS_PER_GAME, token.seed)[token.round])
+
+    if finished:
+        if in_session:
+            session.pop(SESSION_GAME_KEY, None)
+        return jsonify({"finished": True})
+    data["token"] = game_tokens.dumps(token._replace(round=token.round + 1))
+    if in_session:
+        session[SESSION_GAME_KEY] = data["token"]
+    return jsonify(data)
+
+
+@app.route('/api/game')
+def new_game():
+    """Return the plan for a whole game in one response.
+
+    Symbol rounds also carry the sentence to show and its audio, cycling
+    through each symbol's sentences the same way the client does, so the
+    client needs no further requests to play the game.
+    """
+    lang = request.args.get('lang') or session.get('lang', 'en')
+    if not _LANG_RE.fullmatch(lang):
+        return _invalid_language(lang)
+
+    deck = get_sentence_deck(lang)
+    if deck:
+        plan = plan_deck(len(deck), ROUNDS_PER_GAME, new_seed())
+        rounds = [_sentence_round(deck[round_plan.target], round_plan) for round_plan in plan]
+        return jsonify({"lang": lang, "mode": "sentence", "rounds": rounds})
+
+    symbols = get_symbol_catalog(lang)
+    if len(symbols) < 3:
+        return _not_enough_symbols()
+
+    locale = get_locale(lang)
+    manifest = get_asset_manifest()
+    audio_variants = get_audio_variants()
+    uses = {}
+    rounds = []
+    for round_plan in plan_game(len(symbols), ROUNDS_PER_GAME, new_seed()):
+        data = _symbol_round(symbols, round_plan)
+        symbol = data["symbol"]
+        sentences = locale.get(f"{symbol}_sentences")
+        if isinstance(sentences, list) and sentences:
+            index = uses.get(symbol, 0) % len(sentences)
+            uses[symbol] = index + 1
+            data["sentence"] = sentences[index]
+            data.update(audio_sources(f"/static/mp3s/{lang}/{symbol}_{index + 1}.mp3", manifest, audio_variants))
+        else:
+            data["sentence"] = locale.get(symbol, symbol)
+        rounds.append(data)
+    return jsonify({"lang": lang, "mode": "symbol", "rounds": rounds})
 
 
 @app.route('/api/quit')
 def quit_game():
-    session.pop('round', None)
-    session.pop('pl_sentences', None)
+    """Drop the game that an older client keeps in the session (see ``next_symbol``)."""
+    session.pop(SESSION_GAME_KEY, None)
     return jsonify({"success": True})
 
 
+@app.route('/admin/reload', methods=['POST'])
+def reload_caches():
+    """Drop the in-memory catalogs of this worker.
+
+    Not proxied by nginx, so it is only reachable on the gunicorn port.
+    """
+    clear_caches()
+    return jsonify({"success": True})
+
+
+def _player_id() -> str:
+    """Return the anonymous id used for this browser's session leaderboard."""
+    player = session.get('player_id')
+    if player is None:
+        player = session['player_id'] = uuid.uuid4().hex[:16]
+    return player
+
+
+def _highscore_data(lang: str) -> dict:
+    player = session.get('player_id')
+    return {
+        "highscore": highscores.best(),
+        "lang_highscore": highscores.best(lang=lang),
+        "session_highscore": highscores.best(player=player) if player else 0,
+    }
+
+
 @app.route('/api/highscore')
 def get_highscore():
-    return jsonify({"highscore": _load_highscore()})
+    return jsonify(_highscore_data(session.get('lang', 'en')))
+
+
+@app.route('/api/leaderboard')
+def get_leaderboard():
+    """Return the top scores overall (``scope=global``), for the current
+    language (``scope=lang``) or for this browser (``scope=session``)."""
+    scope = request.args.get('scope', 'global')
+    # SQLite reads a negative LIMIT as no limit at all.
+    limit = max(1, min(request.args.get('limit', 10, type=int), 100))
+    if scope == 'lang':
+        scores = highscores.leaderboard(lang=session.get('lang', 'en'), limit=limit)
+    elif scope == 'session':
+        player = session.get('player_id')
+        scores = highscores.leaderboard(player=player, limit=limit) if player else []
+    elif scope == 'global':
+        scores = highscores.leaderboard(limit=limit)
+    else:
+        return jsonify({"error": f"Unknown scope: {scope}"}), 400
+    return jsonify({"scope": scope, "scores": scores})
 
 
 @app.route('/api/submit', methods=['POST'])
 def submit_score():
     data = request.get_json(silent=True) or {}
-    score = int(data.get('score', 0))
-    current = _load_highscore()
-    if score > current:
-        _save_highscore(score)
-        current = score
+    try:
+        score = int(data.get('score', 0))
+    except (TypeError, ValueError):
+        return jsonify({"error": "score must be an integer"}), 400
+    score = max(0, min(score, ROUNDS_PER_GAME))
+    current = highscores.submit(score, session.get('lang', 'en'), _player_id())
     return jsonify({"highscore": current})
 
 
 if __name__ == "__main__":
-    _save_highscore(0)  # Erase highscore on startup
+    highscores.reset()  # Erase highscores on startup
     app.run(host="0.0.0.0", port=5000, debug=True)
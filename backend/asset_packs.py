@@ -0,0 +1,116 @@
+"""Per-language asset archives written by ``tools/pack_assets.py``.
+
+An archive starts with an index of its members' offsets, followed by the
+members' bytes back to back. Each worker maps an archive into memory once and
+serves members from the mapping: no file is opened or read per request, and
+the pages are shared with the other workers through the page cache. This is
+not zero-copy: WSGI servers take ``bytes``, so every chunk of a response is
+copied once out of the mapping. An archive replaced on disk is mapped again on its next use; requests
+still reading the old mapping finish undisturbed.
+"""
+import io
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+# Must match tools/pack_assets.py.
+MAGIC = b"4ACESPK1"
+HEADER = struct.Struct("<8sQ")
+
+
+class Member(NamedTuple):
+    offset: int
+    size: int
+    hash: str  # content hash, used as the ETag
+
+
+class MemberReader(io.RawIOBase):
+    """A seekable read-only file over one member of a mapped archive.
+
+    ``read`` copies straight from the mapping into the returned ``bytes``;
+    the inherited one would copy into a buffer first and then again.
+    """
+
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(len(self._view), self._pos + size)
+        data = bytes(self._view[self._pos:end])
+        self._pos += len(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        n = max(0, min(len(buffer), len(self._view) - self._pos))
+        buffer[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+class PackArchive:
+    """A memory-mapped archive and its member index."""
+
+    def __init__(self, path: Path):
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+        magic, length = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an asset archive")
+        index = json.loads(self._map[HEADER.size:HEADER.size + length])
+        self.members = {name: Member(*entry) for name, entry in index["members"].items()}
+
+    def open(self, name: str) -> MemberReader:
+        member = self.members[name]
+        return MemberReader(memoryview(self._map)[member.offset:member.offset + member.size])
+
+
+_archives = {}  # path -> PackArchive
+_lock = threading.Lock()
+
+
+def _stamp(path: Path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def get_archive(path: Path):
+    """Return the mapped archive at ``path``; ``None`` if there is none."""
+    stamp = _stamp(path)
+    if stamp is None:
+        return None
+    archive = _archives.get(path)
+    if archive is not None and archive.stamp == stamp:
+        return archive
+
+    with _lock:
+        archive = _archives.get(path)
+        if archive is None or archive.stamp != stamp:
+            try:
+                archive = _archives[path] = PackArchive(path)
+            except (OSError, ValueError, struct.error):
+                return None
+    return archive
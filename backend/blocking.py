@@ -0,0 +1,49 @@
+"""Keep blocking calls off the event loop under gevent workers.
+
+With ``gunicorn -k gevent`` (see ``gunicorn.conf.py``) the requests of a
+worker run as greenlets in one OS thread. Socket I/O yields to other
+greenlets once gevent has monkey-patched the standard library, but SQLite
+queries and file reads are plain C calls that would stall every other request
+of the worker while they run. ``offload`` moves them to gevent's pool of
+native threads; under sync workers it is a plain call.
+"""
+import sys
+import threading
+from functools import wraps
+
+# Marks the pool threads, so that nested calls run in place.
+_pool_thread = threading.local()
+
+
+def _gevent_active() -> bool:
+    monkey = sys.modules.get("gevent.monkey")
+    return monkey is not None and monkey.is_module_patched("socket")
+
+
+def _on_pool(f, args, kwargs):
+    _pool_thread.active = True
+    return f(*args, **kwargs)
+
+
+def run_blocking(f, *args, **kwargs):
+    """Call ``f``, on gevent's thread pool if running under gevent.
+
+    A call made from a pool thread runs directly: that thread is already
+    off the event loop, and waiting on the pool from it could deadlock.
+    """
+    if _gevent_active() and not getattr(_pool_thread, "active", False):
+        import gevent
+        return gevent.get_hub().threadpool.apply(_on_pool, (f, args, kwargs))
+    return f(*args, **kwargs)
+
+
+def offload(f):
+    """Decorator form of ``run_blocking``.
+
+    Functions that use ``threading.local`` keep working: under gevent each
+    pool thread gets its own copy, just like a thread of a sync worker.
+    """
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        return run_blocking(f, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,39 @@
+"""Signed game tokens.
+
+A game in progress is described by a short token instead of server-side
+state: its language, the seed its round plan is drawn from (see
+``rounds.py``), the index of the next round and the version of the catalog
+the plan indexes into. ``/api/next`` returns the token for the following
+round with every round and the client sends it back, so any worker on any
+host that shares ``SECRET_KEY`` can serve the next round.
+
+Tokens are signed, not encrypted: a client can read them but not forge them.
+"""
+from typing import NamedTuple
+
+from itsdangerous import BadSignature, URLSafeSerializer
+
+
+class GameToken(NamedTuple):
+    lang: str
+    seed: int
+    round: int
+    version: str  # see ``get_game_catalog`` in ``app.py``
+
+
+class GameTokens:
+    """Signs and verifies :class:`GameToken` values with the app's secret key."""
+
+    def __init__(self, secret_key: str):
+        self._serializer = URLSafeSerializer(secret_key, salt="game-token")
+
+    def dumps(self, token: GameToken) -> str:
+        return self._serializer.dumps(list(token))
+
+    def loads(self, value: str):
+        """Return the :class:`GameToken` in ``value``; ``None`` if it is
+        malformed or was not signed with our key."""
+        try:
+            return GameToken(*self._serializer.loads(value))
+        except (BadSignature, TypeError):
+            return None
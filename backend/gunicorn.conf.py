@@ -0,0 +1,68 @@
+"""Production gunicorn settings.
+
+    gunicorn -c backend/gunicorn.conf.py backend.app:app
+
+Workers use gevent when it is installed (``pip install gevent``): a request
+waiting on a slow client then only parks a greenlet instead of holding the
+whole worker, so a few tablets on a bad connection cannot stall everyone
+else. SQLite and file reads are moved off the event loop by ``blocking.py``.
+Without gevent, plain sync workers are used.
+
+The app is loaded once in the master, which fills its catalogs with
+``warm_caches()`` before forking, so workers start ready to serve and share
+those pages copy-on-write. There is no reloader; use ``python backend/app.py``
+for development.
+
+``WEB_CONCURRENCY`` sets the number of workers; ``GUNICORN_BIND`` and
+``GUNICORN_WORKER_CLASS`` override the address and the worker class, and
+``GUNICORN_PRELOAD=0`` loads the app in each worker instead.
+Command-line options take precedence over this file.
+"""
+import gc
+import importlib.util
+import os
+import time
+
+bind = os.environ.get("GUNICORN_BIND", "127.0.0.1:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+worker_class = os.environ.get(
+    "GUNICORN_WORKER_CLASS",
+    "gevent" if importlib.util.find_spec("gevent") else "sync",
+)
+# Concurrent requests per gevent worker.
+worker_connections = 200
+timeout = 30
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") != "0"
+
+if preload_app and worker_class == "gevent":
+    # The preloaded app creates locks and thread-locals at import time, before
+    # the workers would patch the standard library; patch it first instead.
+    from gevent import monkey
+    monkey.patch_all()
+
+
+def _warm(log, where):
+    from backend.app import warm_caches
+    report = warm_caches()
+    log.info("Warmed caches %s: %d languages (%d sentence decks, %d symbol catalogs) in %.0f ms",
+             where, report["languages"], report["sentence_decks"], report["symbol_catalogs"],
+             report["seconds"] * 1000)
+
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        _warm(server.log, "before forking")
+        # Keep the garbage collector from touching (and so copying) the
+        # warmed objects in every worker.
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    worker.forked_at = time.perf_counter()
+
+
+def post_worker_init(worker):
+    if not worker.cfg.preload_app:
+        _warm(worker.log, f"in worker {worker.pid}")
+    worker.log.info("Worker %d ready %.0f ms after fork", worker.pid,
+                    (time.perf_counter() - worker.forked_at) * 1000)
@@ -0,0 +1,163 @@
+"""High score storage shared by every gunicorn worker on the host.
+
+Scores live in a SQLite database in WAL mode, so concurrent submissions from
+different workers are serialised by SQLite's own locking and a reader never
+sees a half-written value. Every submitted score is kept, which makes the
+global, per-language and per-player (session) leaderboards plain queries.
+
+Reads are cached per thread and revalidated with ``PRAGMA data_version``,
+which only changes when another connection commits. That check touches the
+shared WAL index rather than the database pages, so ``/api/highscore`` stays
+cheap. Under gevent workers the queries run on a native thread pool (see
+``blocking.py``).
+"""
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+try:
+    from .blocking import offload
+    from .metrics import timed
+except ImportError:  # running as ``python backend/app.py``
+    from blocking import offload
+    from metrics import timed
+
+DEFAULT_DB_PATH = Path(__file__).parent / "highscores.sqlite3"
+# Single-value file used before the SQLite store; imported once if present.
+LEGACY_FILE = Path(__file__).parent / "highscore.txt"
+# Cached read results per thread; player and language keys come from clients.
+QUERY_CACHE_SIZE = 256
+
+
+class HighScores:
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = str(path)
+        self._local = threading.local()
+        # pid of the process that already looked for the legacy file.
+        self._legacy_checked = None
+        self._legacy_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread, reopened after gunicorn forks a worker.
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            " id INTEGER PRIMARY KEY,"
+            " player TEXT NOT NULL,"
+            " lang TEXT NOT NULL,"
+            " score INTEGER NOT NULL,"
+            " created REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS scores_lang ON scores (lang, score)")
+        conn.execute("CREATE INDEX IF NOT EXISTS scores_player ON scores (player, score)")
+        conn.execute("CREATE INDEX IF NOT EXISTS scores_score ON scores (score DESC, created)")
+        if self._legacy_checked != os.getpid():
+            with self._legacy_lock:
+                if self._legacy_checked != os.getpid():
+                    self._import_legacy(conn)
+                    self._legacy_checked = os.getpid()
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        self._local.cache = {}
+        self._local.version = None
+        return conn
+
+    @staticmethod
+    def _import_legacy(conn: sqlite3.Connection) -> None:
+        try:
+            legacy = int(LEGACY_FILE.read_text().strip())
+        except (OSError, ValueError):
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM scores LIMIT 1").fetchone() is None and legacy > 0:
+                conn.execute(
+                    "INSERT INTO scores (player, lang, score, created) VALUES ('', '', ?, ?)",
+                    (legacy, time.time()),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        LEGACY_FILE.unlink(missing_ok=True)
+
+    def _query(self, key, sql: str, params=()):
+        """Run a read query, answering from the thread's cache while valid."""
+        conn = self._connect()
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        cache = self._local.cache
+        if version != self._local.version:
+            cache.clear()
+            self._local.version = version
+        if key not in cache:
+            if len(cache) >= QUERY_CACHE_SIZE:
+                cache.clear()
+            cache[key] = conn.execute(sql, params).fetchall()
+        return cache[key]
+
+    def _best(self, lang: str = None, player: str = None) -> int:
+        if lang is not None:
+            rows = self._query(("best", "lang", lang),
+                               "SELECT MAX(score) FROM scores WHERE lang = ?", (lang,))
+        elif player is not None:
+            rows = self._query(("best", "player", player),
+                               "SELECT MAX(score) FROM scores WHERE player = ?", (player,))
+        else:
+            rows = self._query(("best",), "SELECT MAX(score) FROM scores")
+        return rows[0][0] or 0
+
+    @timed("highscores.best")
+    @offload
+    def best(self, lang: str = None, player: str = None) -> int:
+        """Return the best score overall, or for one language or player."""
+        return self._best(lang, player)
+
+    @timed("highscores.leaderboard")
+    @offload
+    def leaderboard(self, lang: str = None, player: str = None, limit: int = 10) -> list:
+        """Return the top ``limit`` scores, optionally for one language or player."""
+        where, params = "", ()
+        if lang is not None:
+            where, params = "WHERE lang = ?", (lang,)
+        elif player is not None:
+            where, params = "WHERE player = ?", (player,)
+        rows = self._query(
+            ("top", lang, player, limit),
+            f"SELECT score, lang, created FROM scores {where} "
+            "ORDER BY score DESC, created ASC LIMIT ?",
+            params + (limit,),
+        )
+        return [{"score": score, "lang": row_lang, "created": created}
+                for score, row_lang, created in rows]
+
+    @timed("highscores.submit")
+    @offload
+    def submit(self, score: int, lang: str, player: str) -> int:
+        """Record ``score`` and return the new overall best."""
+        conn = self._connect()
+        conn.execute(
+            "INSERT INTO scores (player, lang, score, created) VALUES (?, ?, ?, ?)",
+            (player, lang, score, time.time()),
+        )
+        # data_version does not change for the connection that wrote.
+        self._local.cache.clear()
+        # Already on the pool thread, where ``best`` would run in place anyway.
+        return self._best()
+
+    @offload
+    def reset(self) -> None:
+        """Delete every recorded score."""
+        self._connect().execute("DELETE FROM scores")
+        self._local.cache.clear()
+
+
+def create_highscores() -> HighScores:
+    """Open the store at ``HIGHSCORE_DB`` or the default path next to this file."""
+    return HighScores(os.environ.get("HIGHSCORE_DB", DEFAULT_DB_PATH))
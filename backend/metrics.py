@@ -0,0 +1,136 @@
+"""Optional in-process metrics, exposed on ``/metrics``.
+
+Set ``METRICS=1`` to enable them. The backend then records:
+
+* ``http_request_duration_seconds`` - latency histogram per route, method and
+  status;
+* ``function_duration_seconds`` - time spent in functions decorated with
+  ``timed`` (catalog loading and high score I/O);
+* ``session_cookie_bytes`` - size of the session cookie sent by the client.
+
+When disabled, ``timed`` returns the function unchanged and ``init_app``
+installs nothing, so the instrumentation costs nothing at all.
+
+Every gunicorn worker keeps its own numbers, and ``/metrics`` answers with
+those of the worker that handled the scrape, labelled with its pid. The route
+is not proxied by nginx, so it is only reachable on the gunicorn port.
+"""
+import bisect
+import os
+import threading
+import time
+from functools import wraps
+
+from flask import Response, g, request
+
+ENABLED = os.environ.get("METRICS", "") not in ("", "0")
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SIZE_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096)
+
+_HELP = {
+    "http_request_duration_seconds": "Time to handle a request, by route.",
+    "function_duration_seconds": "Time spent in instrumented functions.",
+    "session_cookie_bytes": "Size of the session cookie sent by the client.",
+}
+
+
+class Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    def __init__(self):
+        self._histograms = {}  # (name, labels) -> Histogram
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, labels: tuple, value: float, buckets: tuple) -> None:
+        with self._lock:
+            histogram = self._histograms.get((name, labels))
+            if histogram is None:
+                histogram = self._histograms[(name, labels)] = Histogram(buckets)
+            histogram.observe(value)
+
+    def render(self) -> str:
+        """Return every histogram in the Prometheus text format."""
+        pid = ("worker", str(os.getpid()))
+        lines = []
+        with self._lock:
+            items = sorted(self._histograms.items())
+            for name in sorted({name for name, _ in self._histograms}):
+                lines.append(f"# HELP {name} {_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, labels), histogram in items:
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels(labels + (pid, ('le', str(bound))))} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(labels + (pid,))} {histogram.sum}")
+                    lines.append(f"{name}_count{_labels(labels + (pid,))} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: tuple) -> str:
+    def escape(value):
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels) + "}"
+
+
+registry = Registry()
+
+
+def timed(name: str):
+    """Record the run time of the decorated function as ``name``."""
+    def decorator(f):
+        if not ENABLED:
+            return f
+        labels = (("function", name),)
+
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                registry.observe("function_duration_seconds", labels,
+                                 time.perf_counter() - start, LATENCY_BUCKETS)
+        return wrapper
+    return decorator
+
+
+def init_app(app) -> None:
+    """Install the request hooks and the ``/metrics`` route, if enabled."""
+    if not ENABLED:
+        return
+
+    @app.before_request
+    def start_timer():
+        g.metrics_start = time.perf_counter()
+        cookie = request.cookies.get(app.config["SESSION_COOKIE_NAME"])
+        if cookie is not None:
+            registry.observe("session_cookie_bytes", (), len(cookie), SIZE_BUCKETS)
+
+    @app.after_request
+    def record_latency(response):
+        start = g.pop("metrics_start", None)
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+            labels = (("route", route), ("method", request.method), ("status", str(response.status_code)))
+            registry.observe("http_request_duration_seconds", labels,
+                             time.perf_counter() - start, LATENCY_BUCKETS)
+        return response
+
+    @app.route("/metrics")
+    def metrics():
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
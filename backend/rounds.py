@@ -0,0 +1,67 @@
+"""Round plans.
+
+A plan lists, for every round of a game, the target symbol and the three
+options shown, all as indices into the language's symbol catalog (or, in
+sentence mode, the card and the order of its images). It is drawn for the
+whole game at once from a small integer seed, so a game token only needs to
+carry the seed: the same seed and catalog size always give the same plan.
+
+Targets are sampled without replacement, so no symbol is asked twice in a
+game unless the catalog has fewer symbols than the game has rounds. The two
+distractors are found by offsetting the target index rather than by
+filtering the catalog, so a round costs the same for 30 symbols or 30000.
+"""
+import random
+from typing import NamedTuple
+
+
+class RoundPlan(NamedTuple):
+    """One round: the index of its target and the options in display order.
+
+    In symbol mode both are catalog indices and ``target`` is one of the
+    three ``options``. In sentence mode ``target`` is the deck index of the
+    card and ``options`` a permutation of the card's three images.
+    """
+    target: int
+    options: tuple
+
+
+def new_seed() -> int:
+    return random.getrandbits(32)
+
+
+def plan_game(size: int, rounds: int, seed: int) -> list:
+    """Return ``rounds`` :class:`RoundPlan` entries for a catalog of ``size``."""
+    if size < 3:
+        raise ValueError(f"need at least 3 symbols, got {size}")
+
+    rng = random.Random(seed)
+    targets = []
+    while len(targets) < rounds:
+        # ``sample`` over a range does not materialise the range.
+        targets.extend(rng.sample(range(size), min(size, rounds - len(targets))))
+
+    plan = []
+    for target in targets:
+        # Two distinct non-zero offsets give two distinct distractors, each
+        # uniformly distributed over the other symbols.
+        first = rng.randrange(1, size)
+        second = rng.randrange(1, size - 1)
+        if second >= first:
+            second += 1
+        options = [target, (target + first) % size, (target + second) % size]
+        rng.shuffle(options)
+        plan.append(RoundPlan(target, tuple(options)))
+    return plan
+
+
+def plan_deck(size: int, rounds: int, seed: int) -> list:
+    """Return up to ``rounds`` :class:`RoundPlan` entries for a sentence deck
+    of ``size`` cards, each card at most once."""
+    rng = random.Random(seed)
+    plan = []
+    for index in rng.sample(range(size), min(size, rounds)):
+        options = [0, 1, 2]
+        rng.shuffle(options)
+        plan.append(RoundPlan(index, tuple(options)))
+    return plan
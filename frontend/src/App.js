@@ -2,23 +2,40 @@ import React from 'react';
 import LandingPage from './LandingPage';
 import LanguagePage from './LanguagePage';
 import Game from './Game';
+import bootstrap, { takeBootstrap } from './bootstrap';
+
+const fetchJson = (url) => fetch(url).then(res => {
+  if (!res.ok) throw new Error(`HTTP ${res.status} for ${url}`);
+  return res.json();
+});
+
+// The UI-only bundle written by tools/split_locales.py; the full locale file
+// also works when the split has not been run.
+const fetchLocale = (lang) =>
+  fetchJson(`/static/locales/ui/${lang}.json`)
+    .catch(() => fetchJson(`/static/locales/${lang}.json`));
 
 const useTranslations = (lang) => {
-  const [translations, setTranslations] = React.useState({});
-  const [isLoaded, setIsLoaded] = React.useState(false);
+  // The bootstrap strings are those of the language the page was rendered for.
+  const inlined = bootstrap.ui && lang === bootstrap.lang ? bootstrap.ui : null;
+  const [translations, setTranslations] = React.useState(inlined || {});
+  const [isLoaded, setIsLoaded] = React.useState(Boolean(inlined));
 
   React.useEffect(() => {
+    if (bootstrap.ui && lang === bootstrap.lang) {
+      setTranslations(bootstrap.ui);
+      setIsLoaded(true);
+      return;
+    }
     setIsLoaded(false);
-    fetch(`/static/locales/${lang}.json?v=${Date.now()}`)
-      .then(res => res.json())
+    fetchLocale(lang)
       .then(data => {
         setTranslations(data);
         setIsLoaded(true);
       })
       .catch(() => {
         // Fallback to English if the language file is not found
-        fetch(`/static/locales/en.json?v=${Date.now()}`)
-          .then(res => res.json())
+        fetchLocale('en')
           .then(data => {
             setTranslations(data);
             setIsLoaded(true);
@@ -35,11 +52,16 @@ const useTranslations = (lang) => {
 
 const App = () => {
   const [path, setPath] = React.useState(window.location.pathname);
-  const [currentLang, setCurrentLang] = React.useState(null);
+  const [currentLang, setCurrentLang] = React.useState(bootstrap.lang || null);
 
   React.useEffect(() => {
     const urlParams = new URLSearchParams(window.location.search);
     const langFromUrl = urlParams.get('lang');
+    if (bootstrap.lang && (!langFromUrl || langFromUrl === bootstrap.lang)) {
+      // The backend already stored ?lang= in the session and rendered the
+      // page for it.
+      return;
+    }
     if (langFromUrl) {
       fetch(`/api/set_lang/${langFromUrl}`);
       setCurrentLang(langFromUrl);
@@ -62,6 +84,8 @@ const App = () => {
   }, []);
 
   const navigate = (newPath) => {
+    // The inlined high score is only current for the page first loaded.
+    takeBootstrap('highscore');
     window.history.pushState({}, '', newPath);
     setPath(newPath);
   };
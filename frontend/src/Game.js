@@ -1,4 +1,8 @@
 import React from 'react';
+import { preloadRound, loadEffect, playEffect, imageAttrs, audioSource } from './assets';
+import { loadPack, offlineGame } from './offline';
+
+const SOUND_EFFECTS = ['correct-ding-gameshow.mp3', 'click-wrong.mp3', 'win-sound-effect.mp3'];
 
 const Game = ({ navigate, t, lang, isLoaded }) => {
   const [round, setRound] = React.useState(0);
@@ -7,59 +11,122 @@ const Game = ({ navigate, t, lang, isLoaded }) => {
   const [sentence, setSentence] = React.useState(null);
   const [audioUrl, setAudioUrl] = React.useState(null);
   const audioRef = React.useRef(null);
-  const [soundEffectUrl, setSoundEffectUrl] = React.useState(null);
-  const soundEffectRef = React.useRef(null);
   const [sentenceIndices, setSentenceIndices] = React.useState({});
   const [options, setOptions] = React.useState([]);
+  const [optionSources, setOptionSources] = React.useState(null);
   const [correct, setCorrect] = React.useState(null);
   const [answerResult, setAnswerResult] = React.useState(null);
   const [phase, setPhase] = React.useState('loading'); // loading, showSymbol, choose, showResult, finished
 
+  // Whole-game plan from /api/game; null when playing round by round.
+  const planRef = React.useRef(null);
+  const nextRoundRef = React.useRef(0);
+  // Signed game token from the last /api/next response; the server keeps no game state.
+  const tokenRef = React.useRef(null);
+  // Sentence shard, only fetched when rounds arrive without their sentences.
+  const sentencesRef = React.useRef({});
+
+  const lookup = (key) => (key in sentencesRef.current ? sentencesRef.current[key] : t(key));
+
+  const showRound = (data) => {
+    if (data.sentence !== undefined) {
+      setSymbol(data.symbol || null);
+      setSentence(data.sentence);
+      setAudioUrl(audioSource(data));
+    } else {
+      setSymbol(data.symbol);
+      const sentences = lookup(`${data.symbol}_sentences`);
+      if (Array.isArray(sentences) && sentences.length > 0) {
+        const currentIndex = sentenceIndices[data.symbol] || 0;
+        setSentence(sentences[currentIndex]);
+        const audioFile = `${data.symbol.toLowerCase()}_${currentIndex + 1}.mp3`;
+        const audioPath = `/static/mp3s/${lang}/${audioFile}`;
+        setAudioUrl(audioPath);
+        setSentenceIndices(prev => ({
+          ...prev,
+          [data.symbol]: (currentIndex + 1) % sentences.length,
+        }));
+      } else {
+        setSentence(lookup(data.symbol));
+      }
+    }
+    // Images only appear in the choose phase; fetch them while the sentence is shown.
+    preloadRound(data);
+    setOptions(data.options);
+    setOptionSources(data.sources || null);
+    setCorrect(data.correct);
+    setPhase('showSymbol');
+    // Show the symbol/sentence for 2 seconds, then ask to choose.
+    setTimeout(() => setPhase('choose'), 2000);
+  };
+
   const loadNext = () => {
-    fetch('/api/next')
+    const plan = planRef.current;
+    if (plan) {
+      const index = nextRoundRef.current++;
+      if (index >= plan.length) {
+        setPhase('finished');
+      } else {
+        showRound(plan[index]);
+        preloadRound(plan[index + 1]);
+      }
+      return;
+    }
+
+    const token = tokenRef.current;
+    fetch(token ? `/api/next?token=${encodeURIComponent(token)}` : `/api/next?lang=${lang}`)
       .then(res => res.json())
       .then(data => {
-        if (data.finished) {
+        tokenRef.current = data.token || null;
+        // An error (e.g. the game data changed under the token) ends the game.
+        if (data.finished || data.error) {
           setPhase('finished');
         } else {
-          if (lang === 'pl') {
-            setSentence(data.sentence);
-            const audioFile = `${data.sentence_key}.mp3`;
-            const audioPath = `/static/mp3s/${lang}/${audioFile}?v=${Date.now()}`;
-            setAudioUrl(audioPath);
-          } else {
-            setSymbol(data.symbol);
-            const sentences = t(`${data.symbol}_sentences`);
-            if (Array.isArray(sentences) && sentences.length > 0) {
-              const currentIndex = sentenceIndices[data.symbol] || 0;
-              setSentence(sentences[currentIndex]);
-              const audioFile = `${data.symbol.toLowerCase()}_${currentIndex + 1}.mp3`;
-              const audioPath = `/static/mp3s/${lang}/${audioFile}?v=${Date.now()}`;
-              setAudioUrl(audioPath);
-              setSentenceIndices(prev => ({
-                ...prev,
-                [data.symbol]: (currentIndex + 1) % sentences.length,
-              }));
-            } else {
-              setSentence(t(data.symbol));
-            }
-          }
-          setOptions(data.options);
-          setCorrect(data.correct);
-          setPhase('showSymbol');
-          // Show the symbol/sentence for 2 seconds, then ask to choose.
-          setTimeout(() => setPhase('choose'), 2000);
+          showRound(data);
         }
       })
       .catch(err => console.error('API error', err));
   };
 
+  const fetchGame = () => fetch(`/api/game?lang=${lang}`)
+    .then(res => {
+      if (!res.ok) throw new Error(`HTTP ${res.status}`);
+      return res.json();
+    })
+    .then(data => data.rounds);
+
+  // Draw the game from the installed language pack without any request, or
+  // fetch the whole game up front; fall back to one request per round.
+  const startGame = () => {
+    loadPack(lang)
+      .then(pack => (pack ? offlineGame(pack) : fetchGame()))
+      .then(rounds => {
+        planRef.current = rounds;
+        nextRoundRef.current = 0;
+        loadNext();
+      })
+      .catch(err => {
+        console.error('Game plan unavailable, loading rounds one by one', err);
+        planRef.current = null;
+        tokenRef.current = null;
+        fetch(`/static/locales/sentences/${lang}.json`)
+          .then(res => res.json())
+          .then(data => { sentencesRef.current = data; })
+          .catch(() => {})
+          .finally(loadNext);
+      });
+  };
+
   React.useEffect(() => {
     if (isLoaded) {
-      loadNext();
+      startGame();
     }
   }, [isLoaded]);
 
+  React.useEffect(() => {
+    SOUND_EFFECTS.forEach(name => loadEffect(name).catch(() => {}));
+  }, []);
+
   React.useEffect(() => {
     if (phase === 'showSymbol' && audioRef.current && audioRef.current.src) {
       audioRef.current.play().catch(error => {
@@ -68,12 +135,6 @@ const Game = ({ navigate, t, lang, isLoaded }) => {
     }
   }, [phase, audioUrl]);
 
-  React.useEffect(() => {
-    if (soundEffectUrl && soundEffectRef.current) {
-      soundEffectRef.current.play().catch(e => console.error("SFX Error:", e));
-    }
-  }, [soundEffectUrl]);
-
   React.useEffect(() => {
     if (phase === 'finished') {
       submitScore();
@@ -82,7 +143,7 @@ const Game = ({ navigate, t, lang, isLoaded }) => {
   }, [phase]);
 
   const playSound = (soundFile) => {
-    setSoundEffectUrl(`/static/mp3s/${soundFile}?v=${Date.now()}`);
+    playEffect(soundFile);
   };
 
   const handleQuit = () => {
@@ -133,7 +194,6 @@ const Game = ({ navigate, t, lang, isLoaded }) => {
   return (
     <div className="game-container">
       <audio ref={audioRef} src={audioUrl} />
-      <audio ref={soundEffectRef} src={soundEffectUrl} />
       <div className="game-stats">
         <img src={`/static/langs/${flag}.svg`} alt={`${lang} flag`} className="game-flag" onClick={() => navigate('/language')} />
         <h2>{t('round')} {round + 1} / 10</h2>
@@ -148,7 +208,7 @@ const Game = ({ navigate, t, lang, isLoaded }) => {
             {options.map((src, i) => (
               <img
                 key={i}
-                src={src}
+                {...imageAttrs(src, optionSources)}
                 alt="option"
                 className="option-image"
                 onClick={() => handleChoice(src)}
@@ -1,9 +1,12 @@
 import React from 'react';
+import { takeBootstrap } from './bootstrap';
 
 const LandingPage = ({ navigate, t, lang }) => {
-  const [highscore, setHighscore] = React.useState('N/A');
+  const [inlined] = React.useState(() => takeBootstrap('highscore'));
+  const [highscore, setHighscore] = React.useState(inlined ? inlined.highscore : 'N/A');
 
   React.useEffect(() => {
+    if (inlined) return;
     fetch('/api/highscore')
       .then(r => r.json())
       .then(data => {
@@ -1,17 +1,48 @@
 import React from 'react';
+import bootstrap from './bootstrap';
+import { installedPacks, installPack, offlineSupported, removePack } from './offline';
+
+// Download or remove the offline pack of one language.
+const PackButton = ({ language, installed, onChange }) => {
+  const [busy, setBusy] = React.useState(false);
+
+  const toggle = (event) => {
+    event.stopPropagation();
+    setBusy(true);
+    (installed ? removePack(language.code) : installPack(language.code))
+      .catch(err => console.error(`Offline pack ${language.code}`, err))
+      .finally(() => {
+        setBusy(false);
+        onChange();
+      });
+  };
+
+  return (
+    <button className="pack-btn" onClick={toggle} disabled={busy}
+      title={`${language.name}: ${installed ? 'remove offline pack' : 'download for offline play'}`}>
+      {busy ? '…' : installed ? '✓' : '⬇'}
+    </button>
+  );
+};
 
 const LanguagePage = ({ navigate, t, setLang }) => {
-  const [languages, setLanguages] = React.useState([]);
+  const [languages, setLanguages] = React.useState(bootstrap.languages || []);
+  const [packs, setPacks] = React.useState([]);
+
+  const refreshPacks = () => installedPacks().then(setPacks);
+  React.useEffect(() => { refreshPacks(); }, []);
 
   React.useEffect(() => {
-    fetch('/api/languages')
+    if (bootstrap.languages) return;
+    fetch('/api/languages?details=1')
       .then(res => res.json())
       .then(data => setLanguages(data))
-      .catch(() => setLanguages(['en'])); // Fallback to English
+      .catch(() => setLanguages([{ code: 'en', name: 'English', flag: '/static/langs/us.svg' }])); // Fallback to English
   }, []);
 
   const handleLanguageSelect = (lang) => {
     fetch(`/api/set_lang/${lang}`)
+      .catch(() => {}) // offline: the game runs from the installed pack
       .then(() => {
         setLang(lang);
         navigate(`/game?lang=${lang}`); // Go directly to the game
@@ -22,14 +53,14 @@ const LanguagePage = ({ navigate, t, setLang }) => {
     <div className="content">
       <h2>{t('choose_your_language')}</h2>
       <div className="lang-options">
-        {languages.map(lang => {
-          const flag = lang === 'en' ? 'us' : lang;
-          return (
-            <div onClick={() => handleLanguageSelect(lang)} key={lang} style={{ cursor: 'pointer' }}>
-              <img src={`/static/langs/${flag}.svg`} alt={lang} />
-            </div>
-          );
-        })}
+        {languages.map(language => (
+          <div onClick={() => handleLanguageSelect(language.code)} key={language.code} style={{ cursor: 'pointer' }}>
+            <img src={language.flag} alt={language.name} title={language.name} />
+            {offlineSupported() && (
+              <PackButton language={language} installed={packs.includes(language.code)} onChange={refreshPacks} />
+            )}
+          </div>
+        ))}
       </div>
     </div>
   );
@@ -0,0 +1,122 @@
+// Client-side cache for round images, sentence audio and sound effects.
+//
+// Everything is keyed by URL and fetched at most once per page load; the
+// browser HTTP cache takes care of later visits, so URLs must not carry
+// per-request cache-busting parameters.
+
+const images = new Map();
+const audios = new Map();
+const effectBuffers = new Map();
+
+const AudioContextClass = window.AudioContext || window.webkitAudioContext;
+let audioContext = null;
+
+const getAudioContext = () => {
+  if (!audioContext && AudioContextClass) {
+    audioContext = new AudioContextClass();
+  }
+  return audioContext;
+};
+
+// Rendered width of an option image; see .option-image in style.css.
+export const OPTION_IMAGE_SIZES = '(max-width: 888px) 45vw, 400px';
+
+const supportsWebp = (() => {
+  const canvas = document.createElement('canvas');
+  canvas.width = canvas.height = 1;
+  return canvas.toDataURL('image/webp').startsWith('data:image/webp');
+})();
+
+// <img> attributes for an option: resized variants when the backend offers
+// them (see add_new_language/optimize_images.py), the original otherwise.
+export const imageAttrs = (src, sources) => {
+  const variants = sources && sources[src];
+  if (!variants) return { src };
+  return {
+    src,
+    srcSet: supportsWebp ? variants.webp : variants.png,
+    sizes: OPTION_IMAGE_SIZES,
+  };
+};
+
+const supportsOpus = (() => {
+  const audio = document.createElement('audio');
+  return !!audio.canPlayType && audio.canPlayType('audio/ogg; codecs="opus"') !== '';
+})();
+
+// Sentence audio of a round: the Opus encoding when the backend offers one
+// (see add_new_language/optimize_audio.py) and the browser can play it.
+export const audioSource = (round) =>
+  (supportsOpus && round.audio_opus) || round.audio || null;
+
+export const preloadImage = (src, sources) => {
+  if (!images.has(src)) {
+    const attrs = imageAttrs(src, sources);
+    const img = new Image();
+    img.decoding = 'async';
+    // Same srcset and sizes as the rendered <img>, so the browser picks the same file.
+    if (attrs.srcSet) {
+      img.sizes = attrs.sizes;
+      img.srcset = attrs.srcSet;
+    }
+    img.src = src;
+    images.set(src, img);
+  }
+  return images.get(src);
+};
+
+export const preloadAudio = (src) => {
+  if (!audios.has(src)) {
+    const audio = new Audio();
+    audio.preload = 'auto';
+    audio.src = src;
+    audios.set(src, audio);
+  }
+  return audios.get(src);
+};
+
+// Warm the cache with everything a round needs before it is shown.
+export const preloadRound = (round) => {
+  if (!round) return;
+  round.options.forEach(src => preloadImage(src, round.sources));
+  const audio = audioSource(round);
+  if (audio) preloadAudio(audio);
+};
+
+const effectUrl = (name) => `/static/mp3s/${name}`;
+
+// Fetch and decode a sound effect once; later plays reuse the decoded buffer.
+export const loadEffect = (name) => {
+  const ctx = getAudioContext();
+  if (!ctx) return Promise.resolve(null);
+  if (!effectBuffers.has(name)) {
+    const pending = fetch(effectUrl(name))
+      .then(res => res.arrayBuffer())
+      // Safari only supports the callback form of decodeAudioData.
+      .then(data => new Promise((resolve, reject) => ctx.decodeAudioData(data, resolve, reject)))
+      .catch(err => {
+        effectBuffers.delete(name);
+        throw err;
+      });
+    effectBuffers.set(name, pending);
+  }
+  return effectBuffers.get(name);
+};
+
+export const playEffect = (name) => {
+  const ctx = getAudioContext();
+  if (!ctx) {
+    new Audio(effectUrl(name)).play().catch(e => console.error('SFX Error:', e));
+    return;
+  }
+  // Contexts start suspended until the page has seen a user gesture.
+  if (ctx.state === 'suspended') ctx.resume();
+  loadEffect(name)
+    .then(buffer => {
+      const source = ctx.createBufferSource();
+      source.buffer = buffer;
+      source.connect(ctx.destination);
+      source.start();
+    })
+    .catch(e => console.error('SFX Error:', e));
+};
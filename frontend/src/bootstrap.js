@@ -0,0 +1,25 @@
+// Data that the backend inlines into index.html (see render_index in
+// backend/app.py): the language, the language list, the UI strings and the
+// high scores. Empty when index.html is served as a plain file, in which case
+// the components fetch everything themselves.
+const readBootstrap = () => {
+  const element = document.getElementById('bootstrap');
+  if (!element) return {};
+  try {
+    return JSON.parse(element.textContent);
+  } catch (e) {
+    return {};
+  }
+};
+
+const bootstrap = readBootstrap();
+
+// Use a value for the first render only: later visits to the same page
+// (e.g. the high score after a game) must ask the backend again.
+export const takeBootstrap = (key) => {
+  const value = bootstrap[key];
+  delete bootstrap[key];
+  return value;
+};
+
+export default bootstrap;
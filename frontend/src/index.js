@@ -1,5 +1,13 @@
 import React from 'react';
 import ReactDOM from 'react-dom';
 import App from './App';
+import { offlineSupported, updatePacks } from './offline';
 
 ReactDOM.render(<App />, document.getElementById('root'));
+
+// Serves installed language packs when the network is unavailable.
+if (offlineSupported()) {
+  navigator.serviceWorker.register('/sw.js')
+    .then(() => (navigator.onLine ? updatePacks() : null))
+    .catch(err => console.error('Service worker registration failed', err));
+}
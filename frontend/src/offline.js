@@ -0,0 +1,159 @@
+// Installable per-language packs, so a game can be played without the
+// network (e.g. on care-home tablets with poor Wi-Fi).
+//
+// /api/pack/<lang> describes a pack: the sentence deck or symbol catalog of
+// the language and a `files` map from every URL a game needs to its
+// revision. Installing stores the files and the pack itself in the
+// `pack-<lang>` cache; /sw.js answers requests from those caches when the
+// network is unavailable. Updating a pack only downloads the files whose
+// revision changed and drops the ones no longer listed. When most of a
+// language's images and audio changed (e.g. on first install), they come from
+// its asset archive (see tools/pack_assets.py) in one request instead.
+import { newSeed, planDeck, planGame } from './rounds';
+
+const packUrl = (lang) => `/api/pack/${lang}`;
+const cacheName = (lang) => `pack-${lang}`;
+const PACK_CACHE_PREFIX = 'pack-';
+// Files downloaded at once while installing.
+const DOWNLOADS = 6;
+// Content types of archive members, which carry no headers of their own.
+const MEMBER_TYPES = {
+  png: 'image/png', jpg: 'image/jpeg', jpeg: 'image/jpeg', gif: 'image/gif', mp3: 'audio/mpeg',
+};
+
+export const offlineSupported = () => 'serviceWorker' in navigator && 'caches' in window;
+
+// The installed pack of `lang`, or null.
+export const loadPack = (lang) => {
+  if (!offlineSupported()) return Promise.resolve(null);
+  return caches.open(cacheName(lang))
+    .then(cache => cache.match(packUrl(lang)))
+    .then(res => (res ? res.json() : null))
+    .catch(() => null);
+};
+
+export const installedPacks = () => {
+  if (!offlineSupported()) return Promise.resolve([]);
+  return caches.keys().then(names => names
+    .filter(name => name.startsWith(PACK_CACHE_PREFIX))
+    .map(name => name.slice(PACK_CACHE_PREFIX.length)));
+};
+
+const download = (cache, url) => {
+  // The page is rendered with the session's high scores; cache a neutral copy.
+  const options = url.startsWith('/?') ? { credentials: 'omit' } : {};
+  return fetch(url, options).then(res => {
+    if (!res.ok) throw new Error(`HTTP ${res.status} for ${url}`);
+    return cache.put(url, res);
+  });
+};
+
+// `symbols/pl/a.png` with hash h -> `/static/symbols/pl/a.<h>.png`, the URL
+// tools/build_manifest.py gives the same content.
+const hashedUrl = (path, hash) => {
+  const dot = path.lastIndexOf('.');
+  return dot > path.lastIndexOf('/')
+    ? `/static/${path.slice(0, dot)}.${hash}${path.slice(dot)}`
+    : `/static/${path}.${hash}`;
+};
+
+// Store the `wanted` URLs held by the `name` archive from one download of the
+// archive. Not worth it when it holds few of them; resolves to the URLs
+// stored, so the caller downloads the rest one by one.
+const installFromArchive = (cache, name, wanted) => fetch(`/api/assets/${name}`)
+  .then(res => (res.ok ? res.json() : null))
+  .then(index => {
+    if (!index) return [];
+    const found = [];
+    Object.entries(index.members).forEach(([path, [offset, size, hash]]) => {
+      [hashedUrl(path, hash), `/static/${path}`].forEach(url => {
+        if (wanted.has(url)) found.push({ url, offset, size, path });
+      });
+    });
+    if (found.length * 2 < Object.keys(index.members).length) return [];
+    return fetch(index.archive)
+      .then(res => {
+        if (!res.ok) throw new Error(`HTTP ${res.status} for ${index.archive}`);
+        return res.arrayBuffer();
+      })
+      .then(buffer => Promise.all(found.map(({ url, offset, size, path }) => {
+        const type = MEMBER_TYPES[path.slice(path.lastIndexOf('.') + 1).toLowerCase()];
+        const headers = { 'Content-Type': type || 'application/octet-stream' };
+        return cache.put(url, new Response(buffer.slice(offset, offset + size), { headers }));
+      })))
+      .then(() => found.map(({ url }) => url));
+  })
+  .catch(() => []);
+
+// Install `lang`, or bring an installed pack up to date. Resolves to the
+// number of files downloaded.
+export const installPack = (lang) => {
+  if (!offlineSupported()) return Promise.reject(new Error('Offline packs are not supported'));
+  return Promise.all([fetch(packUrl(lang), { cache: 'no-cache' }), loadPack(lang), caches.open(cacheName(lang))])
+    .then(([res, installed, cache]) => {
+      if (!res.ok) throw new Error(`HTTP ${res.status} for ${packUrl(lang)}`);
+      return res.clone().json().then(pack => {
+        const previous = installed ? installed.files : {};
+        const changed = Object.keys(pack.files).filter(url => previous[url] !== pack.files[url]);
+        const removed = Object.keys(previous).filter(url => !(url in pack.files));
+
+        const wanted = new Set(changed);
+        return Promise.all([lang, 'common'].map(name => installFromArchive(cache, name, wanted)))
+          .then(stored => {
+            stored.flat().forEach(url => wanted.delete(url));
+            const rest = [...wanted];
+            let next = 0;
+            const worker = () => (next < rest.length ? download(cache, rest[next++]).then(worker) : null);
+            return Promise.all(Array.from({ length: DOWNLOADS }, worker));
+          })
+          .then(() => Promise.all(removed.map(url => cache.delete(url))))
+          // Stored last: a pack only counts as installed once all its files are.
+          .then(() => cache.put(packUrl(lang), res))
+          .then(() => changed.length);
+      });
+    });
+};
+
+export const removePack = (lang) => (offlineSupported() ? caches.delete(cacheName(lang)) : Promise.resolve(false));
+
+// Bring every installed pack up to date; called on startup when online.
+export const updatePacks = () => installedPacks()
+  .then(langs => Promise.all(langs.map(lang => installPack(lang).catch(err => {
+    console.error(`Could not update the ${lang} pack`, err);
+  }))));
+
+// A whole game from an installed pack, in the shape /api/game returns.
+export const offlineGame = (pack, seed = newSeed()) => {
+  if (pack.mode === 'sentence') {
+    return planDeck(pack.deck.length, pack.rounds, seed).map(({ target, options }) => {
+      const card = pack.deck[target];
+      return {
+        sentence_key: card.sentence_key,
+        sentence: card.sentence,
+        options: options.map(i => card.options[i]),
+        correct: card.correct,
+        audio: card.audio,
+        audio_opus: card.audio_opus,
+        finished: false,
+      };
+    });
+  }
+
+  // Cycle through each symbol's sentences the way /api/game does.
+  const uses = new Map();
+  return planGame(pack.symbols.length, pack.rounds, seed).map(({ target, options }) => {
+    const entry = pack.symbols[target];
+    const index = (uses.get(entry.symbol) || 0) % entry.sentences.length;
+    uses.set(entry.symbol, index + 1);
+    const [sentence, audio, audioOpus] = entry.sentences[index];
+    return {
+      symbol: entry.symbol,
+      options: options.map(i => pack.symbols[i].image),
+      correct: entry.image,
+      sentence,
+      audio,
+      audio_opus: audioOpus,
+      finished: false,
+    };
+  });
+};
@@ -0,0 +1,68 @@
+// Round plans for games played from an installed language pack (see
+// offline.js). Mirrors backend/rounds.py: targets are sampled without
+// replacement and distractors are picked by offsetting the target index, so
+// a round costs the same however large the catalog is. Plans drawn here do
+// not match the server's for the same seed; only the algorithm is shared.
+
+// mulberry32: a small seeded generator returning floats in [0, 1).
+const seededRandom = (seed) => {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6D2B79F5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+};
+
+const randrange = (random, start, stop) => start + Math.floor(random() * (stop - start));
+
+// `count` distinct indices from [0, size): a partial Fisher-Yates shuffle
+// that only remembers the positions it swapped.
+const sample = (random, size, count) => {
+  const swapped = new Map();
+  const result = [];
+  for (let i = 0; i < count; i++) {
+    const j = randrange(random, i, size);
+    result.push(swapped.has(j) ? swapped.get(j) : j);
+    swapped.set(j, swapped.has(i) ? swapped.get(i) : i);
+  }
+  return result;
+};
+
+const shuffle = (random, items) => {
+  for (let i = items.length - 1; i > 0; i--) {
+    const j = randrange(random, 0, i + 1);
+    [items[i], items[j]] = [items[j], items[i]];
+  }
+  return items;
+};
+
+export const newSeed = () => Math.floor(Math.random() * 4294967296);
+
+// [{ target, options }] for a symbol catalog of `size`; options are three
+// distinct catalog indices in display order, one of them the target.
+export const planGame = (size, rounds, seed) => {
+  if (size < 3) throw new Error(`need at least 3 symbols, got ${size}`);
+  const random = seededRandom(seed);
+  const targets = [];
+  while (targets.length < rounds) {
+    targets.push(...sample(random, size, Math.min(size, rounds - targets.length)));
+  }
+  return targets.map(target => {
+    const first = randrange(random, 1, size);
+    let second = randrange(random, 1, size - 1);
+    if (second >= first) second += 1;
+    const options = shuffle(random, [target, (target + first) % size, (target + second) % size]);
+    return { target, options };
+  });
+};
+
+// [{ target, options }] for a sentence deck of `size`: each card at most
+// once, options being the display order of the card's three images.
+export const planDeck = (size, rounds, seed) => {
+  const random = seededRandom(seed);
+  return sample(random, size, Math.min(size, rounds))
+    .map(target => ({ target, options: shuffle(random, [0, 1, 2]) }));
+};
@@ -0,0 +1,37 @@
+// Service worker for offline language packs (see src/offline.js).
+//
+// The page fills the `pack-<lang>` caches; this worker only answers from
+// them. Content-hashed URLs never change, so they come from the cache first.
+// Everything else goes to the network first, so updates are still seen
+// online, and falls back to the cache offline. Page loads fall back to the
+// page cached with a pack.
+
+const HASHED_URL = /\.[0-9a-f]{10}\.[^./]+$/;
+
+self.addEventListener('install', () => self.skipWaiting());
+self.addEventListener('activate', event => event.waitUntil(self.clients.claim()));
+
+const cachedPage = (url) => {
+  const lang = url.searchParams.get('lang');
+  const byLang = lang ? caches.match(`/?lang=${lang}`) : Promise.resolve(undefined);
+  return byLang.then(res => res || caches.keys().then(names => {
+    // No pack for that language: start with the first one installed.
+    const pack = names.find(name => name.startsWith('pack-'));
+    return pack ? caches.match(`/?lang=${pack.slice('pack-'.length)}`) : undefined;
+  })).then(res => res || Response.error());
+};
+
+self.addEventListener('fetch', event => {
+  const request = event.request;
+  const url = new URL(request.url);
+  if (request.method !== 'GET' || (url.origin === self.location.origin && url.pathname.startsWith('/api/'))) {
+    return;
+  }
+  if (request.mode === 'navigate') {
+    event.respondWith(fetch(request).catch(() => cachedPage(url)));
+  } else if (HASHED_URL.test(url.pathname)) {
+    event.respondWith(caches.match(request).then(cached => cached || fetch(request)));
+  } else {
+    event.respondWith(fetch(request).catch(() => caches.match(request).then(cached => cached || Response.error())));
+  }
+});
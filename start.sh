@@ -1,8 +1,13 @@
 
 #!/bin/sh
 
+# SECRET_KEY signs sessions and game tokens; every worker, restart and host
+# must share it, so refuse to start without one.
+: "${SECRET_KEY:?SECRET_KEY must be set, e.g. SECRET_KEY=\$(openssl rand -hex 32)}"
+
 # Start the Gunicorn server in the background
-gunicorn --bind 127.0.0.1:5000 --workers 4 --reload backend.app:app &
+# (settings, including gevent workers, are in backend/gunicorn.conf.py)
+gunicorn -c backend/gunicorn.conf.py backend.app:app &
 
 # Start Nginx in the foreground
 nginx -g 'daemon off;'
@@ -0,0 +1,325 @@
+#!/usr/bin/env python
+import argparse
+import http.cookiejar
+import json
+import os
+import secrets
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_RESULTS = PROJECT_ROOT / "benchmarks" / "api_results.jsonl"
+ROUNDS = 10
+PERCENTILES = (50, 95, 99)
+
+
+# --- Clients ---
+# A client plays one game session and keeps its own cookies, like a tablet.
+
+class TestClient:
+    """Drives the app in-process through Flask's test client."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def get(self, path):
+        response = self.client.get(path)
+        return response.status_code, response.get_data()
+
+    def post_json(self, path, data):
+        response = self.client.post(path, json=data)
+        return response.status_code, response.get_data()
+
+
+class HttpClient:
+    """Drives a running server over HTTP with a private cookie jar."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+
+    def _send(self, request):
+        with self.opener.open(request, timeout=30) as response:
+            return response.status, response.read()
+
+    def get(self, path):
+        return self._send(urllib.request.Request(self.base_url + path))
+
+    def post_json(self, path, data):
+        return self._send(urllib.request.Request(
+            self.base_url + path, data=json.dumps(data).encode('utf-8'),
+            headers={"Content-Type": "application/json"}, method="POST",
+        ))
+
+
+def play_session(client, lang, timings):
+    """Set the language, play a whole game and submit the score.
+
+    Appends ``(endpoint, seconds)`` to ``timings`` for every request.
+    """
+    def timed(endpoint, call, *args):
+        start = time.perf_counter()
+        status, body = call(*args)
+        timings.append((endpoint, time.perf_counter() - start))
+        if status >= 400:
+            raise RuntimeError(f"{endpoint} returned {status}")
+        return body
+
+    timed("set_lang", client.get, f"/api/set_lang/{lang}")
+    path = f"/api/next?lang={lang}"
+    for _ in range(ROUNDS):
+        # Each round returns the game token for the next one.
+        token = json.loads(timed("next", client.get, path)).get("token")
+        path = f"/api/next?token={token}"
+    timed("submit", client.post_json, "/api/submit", {"score": ROUNDS // 2})
+
+
+def run_load(make_client, lang, sessions, concurrency):
+    """Play ``sessions`` games, ``concurrency`` at a time.
+
+    Returns the timings, the number of games that failed and the wall time.
+    """
+    timings = []
+    errors = []
+    lock = threading.Lock()
+
+    def one_session(_):
+        local = []
+        try:
+            play_session(make_client(), lang, local)
+        except Exception as e:
+            with lock:
+                errors.append(e)
+        with lock:
+            timings.extend(local)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one_session, range(sessions)))
+    if errors:
+        print(f"{len(errors)} game(s) failed, e.g.: {errors[0]!r}")
+    return timings, len(errors), time.perf_counter() - start
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(timings, wall):
+    endpoints = {}
+    for endpoint in sorted({name for name, _ in timings}):
+        values = sorted(seconds for name, seconds in timings if name == endpoint)
+        endpoints[endpoint] = {
+            "count": len(values),
+            "rps": len(values) / wall,
+            **{f"p{p}_ms": percentile(values, p) * 1000 for p in PERCENTILES},
+        }
+    return {"requests": len(timings), "wall_s": wall, "rps": len(timings) / wall, "endpoints": endpoints}
+
+
+# --- Targets ---
+
+def test_client_target(tmp_dir):
+    """Import the app with its high scores in ``tmp_dir`` and return a client factory."""
+    os.environ["HIGHSCORE_DB"] = str(Path(tmp_dir) / "highscores.sqlite3")
+    os.environ.setdefault("SECRET_KEY", secrets.token_hex(16))
+    sys.path.insert(0, str(PROJECT_ROOT))
+    from backend.app import app
+    return lambda: TestClient(app)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_gunicorn(workers, tmp_dir, extra_args=()):
+    """Start gunicorn on a free port and wait until it answers."""
+    port = _free_port()
+    # Every worker must sign game tokens with the same key.
+    env = dict(os.environ,
+               HIGHSCORE_DB=str(Path(tmp_dir) / "highscores.sqlite3"),
+               SECRET_KEY=os.environ.get("SECRET_KEY") or secrets.token_hex(16))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{port}",
+         "--workers", str(workers), "--log-level", "warning", *extra_args, "backend.app:app"],
+        cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {process.returncode}")
+        try:
+            urllib.request.urlopen(base_url + "/api/get_lang", timeout=1).read()
+            return process, base_url
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("gunicorn did not start within 30s")
+
+
+def start_slow_clients(base_url, count):
+    """Hold ``count`` connections busy by sending a request one header line
+    at a time, like tablets on a poor connection. Returns a stop event."""
+    host, port = base_url.rsplit("//", 1)[1].split(":")
+    stop = threading.Event()
+
+    def trickle():
+        while not stop.is_set():
+            try:
+                with socket.create_connection((host, int(port)), timeout=60) as s:
+                    s.sendall(b"GET /api/get_lang HTTP/1.1\r\nHost: localhost\r\n")
+                    while not stop.wait(0.5):
+                        s.sendall(b"X-Slow-Client: 1\r\n")
+                    s.sendall(b"Connection: close\r\n\r\n")
+                    s.recv(4096)
+            except OSError:
+                stop.wait(0.5)
+
+    for _ in range(count):
+        threading.Thread(target=trickle, daemon=True).start()
+    return stop
+
+
+# --- Results ---
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def config_key(record):
+    return tuple(record.get(k) for k in ("target", "workers", "lang", "sessions", "concurrency", "slow_clients"))
+
+
+def load_previous(results_path):
+    """Return the latest stored record for each configuration."""
+    previous = {}
+    try:
+        with open(results_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    previous[config_key(record)] = record
+    except OSError:
+        pass
+    return previous
+
+
+def print_record(record, previous):
+    label = f"{record['target']} workers={record['workers']} lang={record['lang']}"
+    if record["slow_clients"]:
+        label += f" slow_clients={record['slow_clients']}"
+    print(f"\n{label}: {record['requests']} requests in {record['wall_s']:.2f}s, {record['rps']:.0f} req/s, "
+          f"{record['failed_games']} failed game(s)")
+    print(f"  {'endpoint':<10}{'count':>7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'p95 vs last':>13}")
+    for endpoint, stats in record["endpoints"].items():
+        change = ""
+        old = previous and previous["endpoints"].get(endpoint)
+        if old and old["p95_ms"]:
+            change = f"{100 * (stats['p95_ms'] - old['p95_ms']) / old['p95_ms']:+.0f}%"
+        print(f"  {endpoint:<10}{stats['count']:>7}{stats['rps']:>9.0f}{stats['p50_ms']:>9.2f}"
+              f"{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}{change:>13}")
+
+
+def main():
+    """
+    Load-tests the game API the way a classroom uses it: many sessions at once,
+    each setting its language, playing ten rounds with /api/next and
+    submitting a score. Runs against Flask's test client in-process and
+    against a local gunicorn for each worker count, then reports p50/p95/p99
+    latency and requests per second per endpoint. Every run is appended to
+    benchmarks/api_results.jsonl and compared with the previous run of the
+    same configuration.
+    """
+    parser = argparse.ArgumentParser(description="Load-test the game API.")
+    parser.add_argument("--targets", default="testclient,gunicorn",
+                        help="Comma-separated: testclient, gunicorn (default: both)")
+    parser.add_argument("--langs", default="en,pl", help="Comma-separated languages (default: en,pl)")
+    parser.add_argument("--workers", default="1,4", help="Comma-separated gunicorn worker counts (default: 1,4)")
+    parser.add_argument("--sessions", type=int, default=50, help="Games per configuration (default: 50)")
+    parser.add_argument("--concurrency", type=int, default=25, help="Games played at once (default: 25)")
+    parser.add_argument("--slow-clients", type=int, default=0,
+                        help="Connections that trickle a request in slowly during gunicorn runs (default: 0)")
+    parser.add_argument("--gunicorn-args", default="",
+                        help="Extra gunicorn arguments, e.g. --gunicorn-args=\"-c backend/gunicorn.conf.py\"")
+    parser.add_argument("--label", default="", help="Free-form note stored with the results")
+    parser.add_argument("--results", type=Path, default=DEFAULT_RESULTS, help="JSON lines file to append results to")
+    parser.add_argument("--no-save", action="store_true", help="Do not store the results")
+    args = parser.parse_args()
+
+    targets = [t for t in args.targets.split(",") if t]
+    langs = [lang for lang in args.langs.split(",") if lang]
+    worker_counts = [int(w) for w in args.workers.split(",") if w]
+    previous = load_previous(args.results)
+    revision = git_revision()
+    records = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for target in targets:
+            if target not in ("testclient", "gunicorn"):
+                parser.error(f"unknown target: {target}")
+            # In-process there is one interpreter, so the worker count does not apply.
+            for workers in ([1] if target == "testclient" else worker_counts):
+                process = stop_slow_clients = None
+                if target == "testclient":
+                    make_client = test_client_target(tmp_dir)
+                    name = target
+                else:
+                    process, base_url = start_gunicorn(workers, tmp_dir, args.gunicorn_args.split())
+                    make_client = lambda: HttpClient(base_url)  # noqa: E731
+                    name = f"gunicorn {args.gunicorn_args}".strip()
+                    if args.slow_clients:
+                        stop_slow_clients = start_slow_clients(base_url, args.slow_clients)
+                try:
+                    for lang in langs:
+                        # One warm-up game so the per-worker caches are built.
+                        run_load(make_client, lang, 1, 1)
+                        timings, errors, wall = run_load(make_client, lang, args.sessions, args.concurrency)
+                        record = {
+                            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                            "revision": revision,
+                            "label": args.label,
+                            "target": name,
+                            "workers": workers,
+                            "lang": lang,
+                            "sessions": args.sessions,
+                            "concurrency": args.concurrency,
+                            "slow_clients": args.slow_clients if process else 0,
+                            "failed_games": errors,
+                            **summarize(timings, wall),
+                        }
+                        print_record(record, previous.get(config_key(record)))
+                        records.append(record)
+                finally:
+                    if stop_slow_clients is not None:
+                        stop_slow_clients.set()
+                    if process is not None:
+                        process.terminate()
+                        process.wait()
+
+    if records and not args.no_save:
+        args.results.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.results, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, sort_keys=True) + "\n")
+        print(f"\nAppended {len(records)} result(s) to {args.results}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+#!/usr/bin/env python
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+STATIC_DIR = PROJECT_ROOT / "frontend" / "static"
+LOCALES_DIR = STATIC_DIR / "locales"
+SOURCES_DIR = PROJECT_ROOT / "add_new_language"
+TTS_DIR = PROJECT_ROOT / "tts"
+# Input fingerprints of the last successful run of every step.
+CACHE_PATH = Path(__file__).parent / ".build_cache.json"
+
+
+class Step(NamedTuple):
+    name: str
+    inputs: tuple       # files or directories the step reads
+    outputs: tuple      # files or directories the step writes
+    run: Callable[[], object]
+    deps: tuple = ()
+    after: tuple = ()   # steps to wait for, whether or not they succeed
+
+
+def load_script(relative_path):
+    """Import one of the standalone scripts so its functions can be called."""
+    path = PROJECT_ROOT / relative_path
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def fingerprint(paths):
+    """Hash the names, sizes and mtimes of every file under ``paths``.
+
+    Precompressed siblings are skipped: they are outputs of the compress step.
+    """
+    digest = hashlib.sha1()
+    for path in paths:
+        files = sorted(p for p in path.rglob("*") if p.is_file() and p.suffix not in (".gz", ".br")) \
+            if path.is_dir() else [path]
+        for p in files:
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                digest.update(f"{p}:missing\n".encode('utf-8'))
+                continue
+            digest.update(f"{p.relative_to(PROJECT_ROOT)}:{st.st_size}:{st.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def write_if_changed(path, text):
+    """Write ``text`` unless the file already holds it, keeping the mtime stable for later steps."""
+    try:
+        if path.read_text(encoding='utf-8') == text:
+            return False
+    except FileNotFoundError:
+        pass
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(text, encoding='utf-8')
+    os.replace(tmp_path, path)
+    return True
+
+
+def source_languages():
+    """Map lang_code -> LanguageName for every add_new_language/<LanguageName>/<code>.svg."""
+    languages = {}
+    for lang_dir in sorted(p for p in SOURCES_DIR.iterdir() if p.is_dir()):
+        if (lang_dir / "generated_sentences.json").exists():
+            for flag in lang_dir.glob("*.svg"):
+                languages[flag.stem] = lang_dir.name
+    return languages
+
+
+def language_steps(code, lang_name, tts_engine, integrate):
+    """The steps that produce one language: TTS text, audio and integration.
+
+    The TTS text is only needed to synthesize audio, so it is left alone
+    (it is often edited by hand) unless audio is synthesized or the language
+    integrated. Integrated languages take it from their locale file.
+    """
+    if not (tts_engine or integrate):
+        return []
+    steps = []
+    tts_txt = TTS_DIR / f"tts_{code}.txt"
+
+    if integrate:
+        sentences_path = SOURCES_DIR / lang_name / "generated_sentences.json"
+
+        def tts_text():
+            lines = load_script("add_new_language/extract_sentences_tts.py").tts_lines(
+                json.loads(sentences_path.read_text(encoding='utf-8')))
+            write_if_changed(tts_txt, "\n".join(lines))
+        steps.append(Step(f"tts-text:{code}", (sentences_path,), (tts_txt,), tts_text))
+    else:
+        locale_path = LOCALES_DIR / f"{code}.json"
+
+        def tts_text():
+            lines = load_script("tts/generate_tts_txt.py").tts_lines(
+                json.loads(locale_path.read_text(encoding='utf-8')))
+            write_if_changed(tts_txt, "\n".join(lines))
+        steps.append(Step(f"tts-text:{code}", (locale_path,), (tts_txt,), tts_text))
+
+    previous = f"tts-text:{code}"
+    if tts_engine:
+        def tts_audio():
+            failures = load_script("tts/generate_tts_audio.py").generate_audio(code, tts_engine)
+            if failures:
+                raise RuntimeError(f"{failures} sentence(s) failed to synthesize")
+        steps.append(Step(f"tts-audio:{code}", (tts_txt,), (TTS_DIR / code,), tts_audio, (previous,)))
+        previous = f"tts-audio:{code}"
+
+    if integrate:
+        def integration():
+            if load_script("add_new_language/integrate_language.py").integrate_languages([(lang_name, code)]) is None:
+                raise RuntimeError("integration failed")
+        steps.append(Step(
+            f"integrate:{code}",
+            (SOURCES_DIR / lang_name, TTS_DIR / code, LOCALES_DIR / "en.json"),
+            (LOCALES_DIR / f"{code}.json", STATIC_DIR / "langs" / f"{code}.svg",
+             STATIC_DIR / "symbols" / code),
+            integration,
+            (previous,),
+        ))
+    return steps
+
+
+def integrations(sources, requested):
+    """Return the codes of the prepared languages to integrate.
+
+    A language is integrated when it has no locale file yet, or when
+    ``requested`` (``LanguageName:code`` strings) names it. Integrated locales
+    are often curated by hand afterwards, so a build never overwrites them
+    unasked.
+    """
+    selected = {code for code in sources if not (LOCALES_DIR / f"{code}.json").exists()}
+    for item in requested:
+        name, sep, code = item.partition(":")
+        if not sep or sources.get(code) != name:
+            raise SystemExit(f"Error: --integrate expects LanguageName:lang_code for a language "
+                             f"prepared under add_new_language/, got '{item}'")
+        selected.add(code)
+    return selected
+
+
+def build_graph(languages, tts_engine, integrate=()):
+    sources = source_languages()
+    selected = integrations(sources, integrate)
+    codes = sorted({p.stem for p in LOCALES_DIR.glob("*.json")} | set(sources))
+    if languages:
+        codes = [code for code in codes if code in languages]
+
+    steps = []
+    for code in codes:
+        steps += language_steps(code, sources.get(code), tts_engine, code in selected)
+    # The global steps wait for the integrations but still run if one fails,
+    # so one broken language does not hold back the assets of the others.
+    integrated = tuple(step.name for step in steps if step.name.startswith("integrate:"))
+
+    steps.append(Step(
+        "images",
+        (STATIC_DIR / "symbols",),
+        (STATIC_DIR / "variants" / "index.json",),
+        lambda: load_script("add_new_language/optimize_images.py").optimize_languages(),
+        after=integrated,
+    ))
+    steps.append(Step(
+        "split-locales",
+        tuple(sorted(LOCALES_DIR.glob("*.json"))),
+        (LOCALES_DIR / "ui", LOCALES_DIR / "sentences"),
+        lambda: load_script("tools/split_locales.py").split_locales(),
+        after=integrated,
+    ))
+    manifest_deps = ("images", "split-locales")
+    # The audio step needs ffmpeg; without it the original mp3s are served.
+    if shutil.which("ffmpeg"):
+        def audio():
+            failures = load_script("add_new_language/optimize_audio.py").optimize_audio()
+            if failures is None:
+                raise RuntimeError("audio processing failed")
+            if failures:
+                raise RuntimeError(f"{failures} audio file(s) failed to process")
+        steps.append(Step(
+            "audio",
+            (STATIC_DIR / "mp3s",),
+            (STATIC_DIR / "variants" / "audio.json",),
+            audio,
+            after=integrated,
+        ))
+        manifest_deps += ("audio",)
+    else:
+        print("Note: ffmpeg not found; skipping the audio step")
+    fingerprinted = load_script("tools/build_manifest.py").FINGERPRINT_DIRS
+    steps.append(Step(
+        "manifest",
+        tuple(STATIC_DIR / d for d in fingerprinted),
+        (STATIC_DIR / "manifest.json", STATIC_DIR / "manifest.conf"),
+        lambda: load_script("tools/build_manifest.py").write_manifest(),
+        manifest_deps,
+    ))
+    packed = load_script("tools/pack_assets.py").PACKED_DIRS
+    steps.append(Step(
+        "packs",
+        tuple(STATIC_DIR / d for d in packed),
+        (STATIC_DIR / "packs",),
+        lambda: load_script("tools/pack_assets.py").pack_assets(),
+        after=integrated,
+    ))
+    steps.append(Step(
+        "compress",
+        (PROJECT_ROOT / "frontend",),
+        (),
+        lambda: load_script("tools/compress_static.py").compress_static(),
+        ("manifest", "packs"),
+    ))
+    return steps
+
+
+def load_cache():
+    try:
+        with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache):
+    tmp_path = CACHE_PATH.with_name(CACHE_PATH.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, CACHE_PATH)
+
+
+def run_graph(steps, cache, jobs, force=False, dry_run=False):
+    """Run every step once its dependencies are done, independent ones in parallel.
+
+    A step is skipped when the fingerprint of its inputs matches the last
+    successful run and its outputs exist. Returns the names of failed steps.
+    """
+    by_name = {step.name: step for step in steps}
+    pending = dict(by_name)
+    done, failed = set(), set()
+    running = {}
+
+    def execute(step):
+        key = fingerprint(step.inputs)
+        if not force and cache.get(step.name) == key and all(p.exists() for p in step.outputs):
+            return "cached", key, 0.0
+        if dry_run:
+            return "would run", None, 0.0
+        start = time.perf_counter()
+        step.run()
+        # Fingerprint again: a step may have written one of its own inputs' directories.
+        return "built", fingerprint(step.inputs), time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while pending or running:
+            for name, step in list(pending.items()):
+                deps = [d for d in step.deps if d in by_name]
+                after = [d for d in step.after if d in by_name]
+                if any(d in failed for d in deps):
+                    print(f"[skip]   {name} (dependency failed)")
+                    failed.add(name)
+                    del pending[name]
+                elif all(d in done for d in deps) and all(d in done or d in failed for d in after):
+                    running[pool.submit(execute, step)] = step
+                    del pending[name]
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                step = running.pop(future)
+                try:
+                    status, key, elapsed = future.result()
+                except Exception as e:
+                    print(f"[failed] {step.name}: {e}")
+                    failed.add(step.name)
+                    continue
+                if key is not None:
+                    cache[step.name] = key
+                done.add(step.name)
+                print(f"[{status}] {step.name}" + (f" in {elapsed:.2f}s" if status == "built" else ""))
+    return failed
+
+
+def main():
+    """
+    Builds every generated asset in one pass: the integration of new
+    languages prepared under add_new_language/ (existing ones only with
+    --integrate), the TTS text and audio of each language (with
+    --tts-engine), resized symbol images, trimmed and transcoded sentence
+    audio (with ffmpeg), split locale bundles, the fingerprint manifest,
+    per-language asset archives and precompressed text assets. Steps form a
+    dependency graph; a step only runs when its inputs changed since its
+    last successful run, and the steps of different languages run in
+    parallel.
+    """
+    parser = argparse.ArgumentParser(description="Build generated assets, skipping up-to-date steps.")
+    parser.add_argument("languages", nargs="*", metavar="lang_code",
+                        help="Only build these languages (default: all)")
+    parser.add_argument("--integrate", action="append", default=[], metavar="LanguageName:lang_code",
+                        help="Re-integrate this prepared language over its existing locale file (repeatable); "
+                             "languages without a locale file are always integrated")
+    parser.add_argument("--tts-engine", help="Also synthesize missing TTS audio with this engine (see tts/generate_tts_audio.py)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Steps to run in parallel")
+    parser.add_argument("--force", action="store_true", help="Run every step, ignoring the cache")
+    parser.add_argument("--dry-run", action="store_true", help="Print which steps would run")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    cache = load_cache()
+    steps = build_graph(set(args.languages), args.tts_engine, args.integrate)
+    try:
+        failed = run_graph(steps, cache, args.jobs, force=args.force, dry_run=args.dry_run)
+    finally:
+        if not args.dry_run:
+            save_cache(cache)
+
+    print(f"{len(steps)} steps, {len(failed)} failed, in {time.perf_counter() - start:.1f}s")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+import hashlib
+import json
+import os
+from pathlib import Path
+
+# Directories under frontend/static whose files get content-hashed URLs.
+FINGERPRINT_DIRS = ("symbols", "variants", "mp3s", "langs", "locales")
+HASH_LENGTH = 10
+# Included by nginx.conf: the hashed URLs that may be cached as immutable.
+NGINX_MAP_NAME = "manifest.conf"
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Precompressed siblings from compress_static.py are served for their original.
+SKIPPED_SUFFIXES = (".gz", ".br")
+
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(relative_path: str, content_hash: str) -> str:
+    """``symbols/pl/a.png`` -> ``symbols/pl/a.<hash>.png``."""
+    stem, dot, suffix = relative_path.rpartition('.')
+    if not dot or '/' in suffix:
+        return f"{relative_path}.{content_hash}"
+    return f"{stem}.{content_hash}.{suffix}"
+
+
+def build_manifest(static_dir: Path) -> dict:
+    files = {}
+    for directory in FINGERPRINT_DIRS:
+        root = static_dir / directory
+        if not root.is_dir():
+            continue
+        for path in sorted(root.rglob("*")):
+            if not path.is_file() or path.name.startswith('.') or path.suffix in SKIPPED_SUFFIXES:
+                continue
+            relative_path = path.relative_to(static_dir).as_posix()
+            files[relative_path] = hashed_name(relative_path, file_hash(path))
+    return {"files": files}
+
+
+def nginx_map(manifest: dict) -> str:
+    """``map`` entries that mark every current hashed URL as immutable.
+
+    A hashed URL that is not listed (an outdated or mistyped hash) still gets
+    the current file from nginx, but is revalidated like the Flask fallback
+    does, rather than pinned for a year.
+    """
+    def quote(value):
+        return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+    lines = [f"{quote('/static/' + hashed)} {quote(IMMUTABLE)};" for hashed in sorted(manifest["files"].values())]
+    return "\n".join(lines) + "\n"
+
+
+def write_atomic(path: Path, text: str) -> None:
+    # Write atomically so a running backend never reads a partial file.
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def write_manifest():
+    project_root = Path(__file__).parent.parent
+    static_dir = project_root / "frontend" / "static"
+    manifest_path = static_dir / "manifest.json"
+
+    if not static_dir.is_dir():
+        print(f"Error: Static directory not found at {static_dir}")
+        return
+
+    manifest = build_manifest(static_dir)
+    write_atomic(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=0, sort_keys=True))
+    write_atomic(static_dir / NGINX_MAP_NAME, nginx_map(manifest))
+
+    print(f"Successfully fingerprinted {len(manifest['files'])} files into {manifest_path}")
+
+
+def main():
+    """
+    Fingerprints every file under frontend/static/{symbols,variants,mp3s,langs,locales}
+    and writes frontend/static/manifest.json, mapping each path to a URL that
+    carries its content hash. The backend emits those URLs and nginx serves
+    them as immutable; frontend/static/manifest.conf lists them for nginx.conf.
+    """
+    write_manifest()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+import gzip
+import os
+from pathlib import Path
+
+try:
+    # Optional: pip install brotli. Without it only .gz files are written.
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_SUFFIXES = {".html", ".js", ".css", ".json", ".svg", ".txt", ".map"}
+COMPRESSED_SUFFIXES = (".gz", ".br")
+# Smaller files fit in a single packet either way.
+MIN_SIZE = 512
+
+
+def is_fresh(target: Path, source: Path) -> bool:
+    try:
+        return target.stat().st_mtime >= source.stat().st_mtime
+    except OSError:
+        return False
+
+
+def write_compressed(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def compress_file(source: Path) -> dict:
+    """Write the ``.gz`` and ``.br`` siblings of ``source`` that are missing
+    or stale; return the size of each kept variant by suffix."""
+    data = None
+    sizes = {}
+    encoders = {".gz": lambda d: gzip.compress(d, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoders[".br"] = lambda d: brotli.compress(d, quality=11)
+
+    for suffix, encode in encoders.items():
+        target = source.with_name(source.name + suffix)
+        if not is_fresh(target, source):
+            if data is None:
+                data = source.read_bytes()
+            compressed = encode(data)
+            # Not worth a second copy unless it is noticeably smaller.
+            if len(compressed) >= len(data) * 0.9:
+                target.unlink(missing_ok=True)
+                continue
+            write_compressed(target, compressed)
+        if target.exists():
+            sizes[suffix] = target.stat().st_size
+    return sizes
+
+
+def compress_tree(root: Path) -> dict:
+    """Compress every compressible file under ``root``; remove orphaned siblings.
+
+    Returns ``{suffix: [files, original bytes, compressed bytes]}``.
+    """
+    totals = {suffix: [0, 0, 0] for suffix in COMPRESSED_SUFFIXES}
+    for path in sorted(root.rglob("*")):
+        if not path.is_file():
+            continue
+        if path.suffix in COMPRESSED_SUFFIXES:
+            if not path.with_suffix("").exists():
+                path.unlink()
+            continue
+        if path.suffix.lower() not in COMPRESSIBLE_SUFFIXES or path.stat().st_size < MIN_SIZE:
+            continue
+        original = path.stat().st_size
+        for suffix, size in compress_file(path).items():
+            totals[suffix][0] += 1
+            totals[suffix][1] += original
+            totals[suffix][2] += size
+    return totals
+
+
+def compress_static():
+    project_root = Path(__file__).parent.parent
+    frontend_dir = project_root / "frontend"
+
+    if brotli is None:
+        print("Warning: brotli is not installed (pip install brotli); writing .gz files only")
+
+    totals = compress_tree(frontend_dir)
+    for suffix, (count, original, compressed) in totals.items():
+        if count:
+            print(f"{suffix}: {count} files, {original:,} -> {compressed:,} bytes "
+                  f"({100 * (original - compressed) / original:.0f}% smaller)")
+    print(f"Successfully compressed text assets under {frontend_dir}")
+
+
+def main():
+    """
+    Writes precompressed .gz and .br siblings next to every text asset under
+    frontend/ (HTML, JS, CSS, JSON, SVG), so nginx (gzip_static/brotli_static)
+    and the Flask fallback can send them without compressing per request.
+    Only missing or outdated siblings are rewritten, and siblings whose
+    source file was removed are deleted. Run it after the other build steps.
+    """
+    compress_static()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+import hashlib
+import json
+import os
+import struct
+import sys
+from pathlib import Path
+
+# Archive layout, read by backend/asset_packs.py:
+#   MAGIC, index length (unsigned 64-bit little-endian), JSON index, members.
+# The index maps each member's path relative to frontend/static to
+# [offset from the start of the file, size, content hash].
+MAGIC = b"4ACESPK1"
+HEADER = struct.Struct("<8sQ")
+# Directories under frontend/static with one subdirectory per language.
+PACKED_DIRS = ("symbols", "mp3s")
+HASH_LENGTH = 10  # same as tools/build_manifest.py
+
+
+def pack_members(static_dir: Path, name: str) -> list:
+    """Return the ``(relative path, path)`` pairs that go into pack ``name``."""
+    members = []
+    for directory in PACKED_DIRS:
+        root = static_dir / directory / name
+        if root.is_dir():
+            for path in sorted(root.rglob("*")):
+                if path.is_file() and not path.name.startswith('.'):
+                    members.append((path.relative_to(static_dir).as_posix(), path))
+    return members
+
+
+def build_index(members: list) -> tuple:
+    """Read every member; return the index and the member contents in order."""
+    entries = {}
+    contents = []
+    for relative_path, path in members:
+        data = path.read_bytes()
+        entries[relative_path] = [len(data), hashlib.sha256(data).hexdigest()[:HASH_LENGTH]]
+        contents.append(data)
+
+    # Offsets depend on the index length, which depends on the offsets' digits;
+    # lay the members out until the header stops growing.
+    header_size = 0
+    while True:
+        offset = header_size
+        index = {}
+        for relative_path, (size, content_hash) in entries.items():
+            index[relative_path] = [offset, size, content_hash]
+            offset += size
+        encoded = json.dumps({"members": index}, sort_keys=True, separators=(",", ":")).encode('utf-8')
+        if HEADER.size + len(encoded) == header_size:
+            return encoded, contents
+        header_size = HEADER.size + len(encoded)
+
+
+def read_index(archive_path: Path):
+    """Return the encoded index of an existing archive, or ``None``."""
+    try:
+        with open(archive_path, 'rb') as f:
+            magic, length = HEADER.unpack(f.read(HEADER.size))
+            return f.read(length) if magic == MAGIC else None
+    except (OSError, struct.error):
+        return None
+
+
+def write_archive(archive_path: Path, encoded_index: bytes, contents: list) -> None:
+    # Written next to the old archive and swapped in, so a running backend
+    # keeps serving its mapping of the old file until it notices the new one.
+    tmp_path = archive_path.with_name(archive_path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(encoded_index)))
+        f.write(encoded_index)
+        for data in contents:
+            f.write(data)
+    os.replace(tmp_path, archive_path)
+
+
+def pack_assets(names=None):
+    project_root = Path(__file__).parent.parent
+    static_dir = project_root / "frontend" / "static"
+    packs_dir = static_dir / "packs"
+
+    if not static_dir.is_dir():
+        print(f"Error: Static directory not found at {static_dir}")
+        return
+
+    available = sorted({p.name for d in PACKED_DIRS if (static_dir / d).is_dir()
+                        for p in (static_dir / d).iterdir() if p.is_dir()})
+    packs_dir.mkdir(parents=True, exist_ok=True)
+    for name in names or available:
+        members = pack_members(static_dir, name)
+        if not members:
+            print(f"Warning: nothing to pack for '{name}'")
+            continue
+
+        archive_path = packs_dir / f"{name}.pack"
+        encoded_index, contents = build_index(members)
+        if read_index(archive_path) == encoded_index:
+            print(f"{name}: up to date ({len(members)} files)")
+            continue
+        write_archive(archive_path, encoded_index, contents)
+        print(f"{name}: {len(members)} files -> {archive_path.stat().st_size:,} bytes")
+
+    # Archives of languages that no longer exist.
+    if not names:
+        for archive_path in packs_dir.glob("*.pack"):
+            if archive_path.stem not in available:
+                archive_path.unlink()
+                print(f"Removed stale {archive_path.name}")
+    print(f"Successfully packed assets into {packs_dir}")
+
+
+def main():
+    """
+    Packs the symbol images and audio of each language
+    (frontend/static/symbols/{lang} and mp3s/{lang}; "common" for the shared
+    symbols) into a single archive, frontend/static/packs/{lang}.pack, with an
+    index of member offsets at its start. The backend serves single members
+    from these archives (/api/assets/{lang}/...) and the archives themselves
+    can be downloaded in one request. Archives whose contents did not change
+    are left untouched.
+
+    Usage: python tools/pack_assets.py [<lang_code> ...]
+    """
+    pack_assets(sys.argv[1:])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+import json
+import os
+from pathlib import Path
+
+
+def ui_keys_from(en_data: dict) -> set:
+    """Return the UI string keys, classified the way integrate_language.py does.
+
+    Symbol names (``apple``) and their ``<symbol>_sentences`` arrays are game
+    content, as are the numbered ``sentence_<n>`` strings of sentence mode.
+    """
+    sentence_keys = {k.replace("_sentences", "") for k in en_data if k.endswith("_sentences")}
+    return {k for k in en_data if not k.endswith("_sentences") and k not in sentence_keys}
+
+
+def write_json(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def split_locales():
+    project_root = Path(__file__).parent.parent
+    locales_dir = project_root / "frontend" / "static" / "locales"
+    en_locale_path = locales_dir / "en.json"
+
+    if not en_locale_path.exists():
+        print(f"Error: en.json not found at {en_locale_path}")
+        return
+
+    with open(en_locale_path, 'r', encoding='utf-8') as f:
+        ui_keys = ui_keys_from(json.load(f))
+
+    for locale_file in sorted(locales_dir.glob("*.json")):
+        lang_code = locale_file.stem
+
+        with open(locale_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        ui = {k: v for k, v in data.items() if k in ui_keys}
+        sentences = {k: v for k, v in data.items() if k not in ui_keys}
+
+        write_json(locales_dir / "ui" / f"{lang_code}.json", ui)
+        write_json(locales_dir / "sentences" / f"{lang_code}.json", sentences)
+
+        ui_size = (locales_dir / "ui" / f"{lang_code}.json").stat().st_size
+        print(f"{lang_code}: {locale_file.stat().st_size} bytes -> UI bundle of {ui_size} bytes "
+              f"({len(ui)} strings) + sentence shard ({len(sentences)} entries)")
+
+
+def main():
+    """
+    Splits every frontend/static/locales/{lang}.json into a small UI bundle
+    (locales/ui/{lang}.json) that the app loads on startup, and a sentence
+    shard (locales/sentences/{lang}.json) with the symbol names and sentences,
+    which the game only needs when the round payload does not carry them.
+    The full locale files stay the source of truth and are left untouched.
+    """
+    split_locales()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,64 +1,203 @@
 #!/usr/bin/env python
-import sys
-from pathlib import Path
+import argparse
+import hashlib
+import importlib
+import json
 import os
+import random
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 
-# This script uses gTTS as an example Text-to-Speech engine.
-# You can replace it with any other TTS library.
-# Make sure to install it first: pip install gTTS
-from gtts import gTTS
+# Records which sentence (and engine) produced each mp3, so reruns only
+# synthesize new or changed sentences.
+MANIFEST_NAME = ".tts_manifest.json"
 
 
-def main():
-    """
-    Generates MP3 files from a tts_{lang}.txt file using a TTS engine.
-    """
-    if len(sys.argv) != 2:
-        print("Usage: python generate_tts_audio.py <lang_code>")
-        print("Example: python generate_tts_audio.py sr")
-        return
+# --- TTS engines ---
+# An engine is a callable ``engine(text, lang_code, output_path)`` that writes
+# an mp3 to ``output_path``. Besides the built-in names below, ``--engine``
+# accepts ``package.module:function`` to plug in any other engine.
+
+def gtts_engine(text, lang_code, output_path):
+    # gTTS is the default online engine: pip install gTTS
+    from gtts import gTTS
+    gTTS(text=text, lang=lang_code, slow=False).save(str(output_path))
+
+
+def espeak_engine(text, lang_code, output_path):
+    """Offline engine: espeak-ng synthesizes a WAV and ffmpeg encodes the mp3."""
+    for tool in ("espeak-ng", "ffmpeg"):
+        if shutil.which(tool) is None:
+            raise RuntimeError(f"{tool} is required for the espeak engine")
+    wav = subprocess.run(
+        ["espeak-ng", "-v", lang_code, "--stdout", text],
+        check=True, capture_output=True,
+    ).stdout
+    subprocess.run(
+        ["ffmpeg", "-loglevel", "error", "-y", "-i", "pipe:0", "-q:a", "4", "-f", "mp3", str(output_path)],
+        input=wav, check=True,
+    )
+
+
+def stub_engine(text, lang_code, output_path):
+    """Writes a placeholder instead of audio; for tests and dry runs."""
+    Path(output_path).write_bytes(f"{lang_code}: {text}\n".encode('utf-8'))
+
+
+ENGINES = {
+    "gtts": gtts_engine,
+    "espeak": espeak_engine,
+    "stub": stub_engine,
+}
+
+
+def load_engine(name):
+    if name in ENGINES:
+        return ENGINES[name]
+    module_name, _, attr = name.partition(":")
+    if not attr:
+        raise SystemExit(f"Unknown engine '{name}'; use one of {sorted(ENGINES)} or module:function")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+# --- Job bookkeeping ---
+
+def read_tts_file(tts_file_path):
+    """Yield ``(symbol_name, sentence)`` pairs from a tts_{lang}.txt file."""
+    with open(tts_file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+
+            parts = line.split(' ', 1)
+            if len(parts) != 2:
+                print(f"Skipping invalid line: {line}")
+                continue
+
+            yield parts[0], parts[1].strip('"')
+
+
+def sentence_hash(engine_name, lang_code, sentence):
+    return hashlib.sha256(f"{engine_name}\0{lang_code}\0{sentence}".encode('utf-8')).hexdigest()
+
 
-    lang_code = sys.argv[1]
+def load_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(path, manifest):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def synthesize_with_retry(engine, sentence, lang_code, output_path, retries, backoff):
+    """Run ``engine``, retrying with exponential backoff and jitter on failure."""
+    # Write next to the target and rename, so an interrupted run never leaves
+    # a truncated mp3 that looks finished.
+    tmp_path = output_path.with_name(output_path.name + ".part")
+    for attempt in range(retries + 1):
+        try:
+            engine(sentence, lang_code, tmp_path)
+            os.replace(tmp_path, output_path)
+            return
+        except Exception:
+            if attempt == retries:
+                tmp_path.unlink(missing_ok=True)
+                raise
+            time.sleep(backoff * 2 ** attempt * (1 + random.random()))
+
+
+def generate_audio(lang_code, engine_name="gtts", workers=4, retries=3, backoff=1.0, force=False):
+    """Synthesize the new or changed sentences of tts/tts_{lang}.txt.
+
+    Returns the number of sentences that failed, or ``None`` if there is no
+    TTS file for the language.
+    """
+    engine = load_engine(engine_name)
 
     project_root = Path(__file__).parent.parent
     tts_file_path = project_root / "tts" / f"tts_{lang_code}.txt"
     output_dir = project_root / "tts" / lang_code
 
-    # Create output directory if it doesn't exist
-    output_dir.mkdir(parents=True, exist_ok=True)
-
     if not tts_file_path.exists():
         print(f"Error: TTS file not found at {tts_file_path}")
-        return
+        return None
 
-    with open(tts_file_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+    # Create output directory if it doesn't exist
+    output_dir.mkdir(parents=True, exist_ok=True)
 
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
+    manifest_path = output_dir / MANIFEST_NAME
+    manifest = {} if force else load_manifest(manifest_path)
 
-        parts = line.split(' ', 1)
-        if len(parts) != 2:
-            print(f"Skipping invalid line: {line}")
+    jobs = []
+    for symbol_name, sentence in read_tts_file(tts_file_path):
+        output_file_path = output_dir / f"{symbol_name}.mp3"
+        digest = sentence_hash(engine_name, lang_code, sentence)
+        if manifest.get(symbol_name) == digest and output_file_path.exists():
             continue
+        jobs.append((symbol_name, sentence, output_file_path, digest))
+
+    print(f"{len(jobs)} sentence(s) to synthesize for '{lang_code}' with {engine_name}")
+    if not jobs:
+        return 0
+
+    failures = 0
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {
+                pool.submit(synthesize_with_retry, engine, sentence, lang_code,
+                            output_file_path, retries, backoff): (symbol_name, sentence, output_file_path, digest)
+                for symbol_name, sentence, output_file_path, digest in jobs
+            }
+            for future in as_completed(futures):
+                symbol_name, sentence, output_file_path, digest = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    failures += 1
+                    print(f"Error generating TTS for '{sentence}': {e}")
+                    continue
+                print(f"Generated TTS for '{sentence}' -> {output_file_path}")
+                manifest[symbol_name] = digest
+    finally:
+        # Saved even when interrupted, so the next run resumes where this one stopped.
+        save_manifest(manifest_path, manifest)
+
+    if failures:
+        print(f"{failures} sentence(s) failed; rerun to retry them.")
+    return failures
 
-        symbol_name = parts[0]
-        sentence = parts[1].strip('"')
-
-        output_file_path = output_dir / f"{symbol_name}.mp3"
 
-        print(f"Generating TTS for '{sentence}' -> {output_file_path}")
+def main():
+    """
+    Generates MP3 files from a tts_{lang}.txt file using a TTS engine.
 
-        # --- TTS Generation ---
-        # This part uses gTTS. You can replace it with your preferred TTS library.
-        try:
-            tts = gTTS(text=sentence, lang=lang_code, slow=False)
-            tts.save(output_file_path)
-        except Exception as e:
-            print(f"Error generating TTS for '{sentence}': {e}")
-        # --- End of TTS Generation ---
+    Sentences are synthesized by a bounded pool of workers, each retried with
+    backoff on failure. A content-hash manifest in the output directory skips
+    sentences whose mp3 already matches, so interrupted or repeated runs only
+    do the remaining work.
+    """
+    parser = argparse.ArgumentParser(description="Generate TTS mp3s for tts/tts_{lang}.txt")
+    parser.add_argument("lang_code", help="Language code, e.g. sr")
+    parser.add_argument("--engine", default="gtts",
+                        help=f"TTS engine: one of {sorted(ENGINES)} or module:function (default: gtts)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent synthesis jobs (default: 4)")
+    parser.add_argument("--retries", type=int, default=3, help="Retries per sentence (default: 3)")
+    parser.add_argument("--backoff", type=float, default=1.0, help="Initial retry delay in seconds (default: 1)")
+    parser.add_argument("--force", action="store_true", help="Regenerate every sentence")
+    args = parser.parse_args()
+
+    generate_audio(args.lang_code, args.engine, args.workers, args.retries, args.backoff, args.force)
 
 
 if __name__ == "__main__":
@@ -2,6 +2,17 @@
 import json
 from pathlib import Path
 
+def tts_lines(locale_data):
+    """Return the ``symbol_name_1 "sentence"`` lines for a locale's sentences."""
+    output_lines = []
+    for key, value in locale_data.items():
+        if key.endswith("_sentences"):
+            symbol_name = key.replace("_sentences", "")
+            if isinstance(value, list):
+                for i, sentence in enumerate(value):
+                    output_lines.append(f'{symbol_name.lower()}_{i+1} "{sentence}"')
+    return output_lines
+
 def main():
     """
     Generates tts_{lang}.txt files for all locales in frontend/static/locales/.
@@ -20,17 +31,9 @@ def main():
         with open(locale_file, 'r', encoding='utf-8') as f:
             data = json.load(f)
 
-        output_lines = []
-        for key, value in data.items():
-            if key.endswith("_sentences"):
-                symbol_name = key.replace("_sentences", "")
-                if isinstance(value, list):
-                    for i, sentence in enumerate(value):
-                        output_lines.append(f'{symbol_name.lower()}_{i+1} "{sentence}"')
-        
         output_tts_path = tts_dir / f"tts_{lang_code}.txt"
         with open(output_tts_path, 'w', encoding='utf-8') as f:
-            f.write("\n".join(output_lines))
+            f.write("\n".join(tts_lines(data)))
 
         print(f"Successfully generated {output_tts_path}")
 